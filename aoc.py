@@ -0,0 +1,220 @@
+"""Run any of the days from a single entry point.
+
+Usage: python -m aoc run --days 1-4 --parts 1,2 --jobs 4
+       python -m aoc serve
+       python -m aoc ask --day 1 --part 2 [--path data/day_01.txt]
+       python -m aoc batch --day 2 inputs/*.txt
+"""
+import argparse
+import importlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from utils import (
+    SOLVERS,
+    Instrumentation,
+    Part,
+    ResultStore,
+    Solver,
+    compute_answer,
+)
+
+ROOT = Path(__file__).parent
+
+
+def discover(root: Path = ROOT) -> dict[int, Solver]:
+    """Import every day_*.py module next to this file so that it registers its solver."""
+    for module in sorted(root.glob("day_*.py")):
+        importlib.import_module(module.stem)
+    return SOLVERS
+
+
+def parse_days(spec: str) -> list[int]:
+    """Turn a spec like "1-3,5" into [1, 2, 3, 5]."""
+    days: set[int] = set()
+    for chunk in spec.split(","):
+        first, _, last = chunk.partition("-")
+        days.update(range(int(first), int(last or first) + 1))
+    return sorted(days)
+
+
+def run_task(
+    day: int,
+    part: Part,
+    memoize: bool,
+    profile: bool = False,
+    trace_memory: bool = False,
+    profile_dir: str | None = None,
+) -> tuple[int, Part, int, int, dict | None]:
+    """Load, parse and solve one part of one day in a worker process.
+
+    When profiling, the input is loaded as usual, with the load phase timing a hit of the
+    parse cache and the parse phase parsing the data file, and the answer is computed
+    without the result store, so that the compute phase is measured.
+
+    Returns
+    -------
+    tuple[int, Part, int, int, dict | None]
+        The day, the part, the answer, the wall time in nanoseconds and, when profiling, the
+        Instrumentation entry.
+    """
+    start = time.perf_counter_ns()
+    solver = discover()[day]
+    part_solver = solver.solver(part)
+    assert part_solver is not None, f"Part {part} of day {day} is not solved yet"
+    if not profile:
+        store = ResultStore() if memoize else None
+        answer = compute_answer(solver.load(), part_solver, store)
+        return day, part, answer, time.perf_counter_ns() - start, None
+
+    instrumentation = Instrumentation(trace_memory, profile_dir)
+    with instrumentation.measure(f"day {day:02d} part {part}") as entry:
+        parsed = solver.load(instrumentation)
+        with instrumentation.phase("compute"):
+            answer = part_solver(parsed)
+    entry.update(day=day, part=int(part), answer=answer)
+    return day, part, answer, time.perf_counter_ns() - start, entry
+
+
+def run(
+    days: list[int],
+    parts: list[Part],
+    jobs: int | None,
+    memoize: bool,
+    report_file: str | None = None,
+    trace_memory: bool = False,
+    profile_dir: str | None = None,
+) -> None:
+    solvers = discover()
+    tasks = [
+        (day, part)
+        for day in days
+        if day in solvers
+        for part in parts
+        if solvers[day].solver(part) is not None
+    ]
+    profile = bool(report_file or trace_memory or profile_dir)
+    start = time.perf_counter_ns()
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [
+            executor.submit(
+                run_task, day, part, memoize, profile, trace_memory, profile_dir
+            )
+            for day, part in tasks
+        ]
+        results = [future.result() for future in futures]
+    total_ms = (time.perf_counter_ns() - start) / 1e6
+
+    for day, part, answer, elapsed_ns, _ in results:
+        print(f"Day {day:2d} part {part}: {answer:>15} ({elapsed_ns / 1e6:9.2f} ms)")
+    print(f"{len(results)} tasks in {total_ms:.2f} ms")
+
+    if profile:
+        report = Instrumentation().report()
+        report["entries"] = [entry for *_, entry in results]
+        if report_file is None:
+            print(json.dumps(report, indent=2))
+        else:
+            Path(report_file).write_text(json.dumps(report, indent=2))
+            print(f"Wrote profile report to {report_file}")
+
+
+def run_batch(
+    day: int,
+    paths: list[str],
+    parts: tuple[Part, ...],
+    jobs: int | None,
+    max_in_flight: int,
+) -> None:
+    import asyncio
+
+    from batch import BatchStats, solve_batch
+
+    async def report() -> None:
+        stats = BatchStats()
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            async for result in solve_batch(
+                day, paths, parts, max_in_flight, executor, stats
+            ):
+                answers = result.error or " ".join(
+                    f"part {part}: {answer}" for part, answer in result.answers.items()
+                )
+                print(f"{result.path}: {answers}")
+        print(
+            f"{stats.files} files ({stats.failures} failed) in {stats.elapsed:.2f} s, "
+            f"{stats.files_per_second:.1f} files/s, {stats.megabytes_per_second:.1f} MB/s"
+        )
+
+    asyncio.run(report())
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m aoc")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="solve days concurrently")
+    run_parser.add_argument("--days", default="1-25", help='e.g. "1-4" or "1,3"')
+    run_parser.add_argument("--parts", default="1,2", help='e.g. "1" or "1,2"')
+    run_parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count())
+    run_parser.add_argument(
+        "--no-memo", action="store_true", help="always recompute the answers"
+    )
+    run_parser.add_argument(
+        "--report", help="profile the phases of every task into this JSON file"
+    )
+    run_parser.add_argument(
+        "--trace-memory", action="store_true", help="profile peak memory too"
+    )
+    run_parser.add_argument("--cprofile", help="write cProfile stats to this directory")
+
+    serve_parser = subparsers.add_parser("serve", help="answer requests from a daemon")
+    serve_parser.add_argument("--socket", help="Unix socket to listen on")
+
+    ask_parser = subparsers.add_parser("ask", help="ask a running daemon for an answer")
+    ask_parser.add_argument("--day", type=int, required=True)
+    ask_parser.add_argument("--part", type=int, required=True)
+    ask_parser.add_argument("--path", help="data file, by default the day's own")
+    ask_parser.add_argument("--socket", help="Unix socket the daemon listens on")
+
+    batch_parser = subparsers.add_parser("batch", help="solve many inputs of one day")
+    batch_parser.add_argument("--day", type=int, required=True)
+    batch_parser.add_argument("--parts", default="1,2", help='e.g. "1" or "1,2"')
+    batch_parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count())
+    batch_parser.add_argument("--max-in-flight", type=int, default=32)
+    batch_parser.add_argument("paths", nargs="+")
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        run(
+            parse_days(args.days),
+            [Part(int(part)) for part in args.parts.split(",")],
+            args.jobs,
+            not args.no_memo,
+            args.report,
+            args.trace_memory,
+            args.cprofile,
+        )
+    elif args.command == "serve":
+        import daemon
+
+        daemon.serve(args.socket or daemon.SOCKET_PATH)
+    elif args.command == "ask":
+        import daemon
+
+        with daemon.Client(args.socket or daemon.SOCKET_PATH) as client:
+            print(client.solve(args.day, Part(args.part), args.path))
+    elif args.command == "batch":
+        run_batch(
+            args.day,
+            args.paths,
+            tuple(Part(int(part)) for part in args.parts.split(",")),
+            args.jobs,
+            args.max_in_flight,
+        )
+
+
+if __name__ == "__main__":
+    main()
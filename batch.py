@@ -0,0 +1,145 @@
+"""Solve one day for many input files at once with asyncio.
+
+Files are read on threads, parsed and solved on a process pool, and results are yielded in
+the order they finish.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, TextIO, cast
+
+from aoc import discover
+from utils import Part, ResultStore, compute_answer, open_text, read_input
+
+if TYPE_CHECKING:
+    from typing import AsyncIterator, Iterable
+
+    from utils import FilePath
+
+
+@dataclass
+class BatchStats:
+    """Throughput counters, updated as results come in.
+
+    files counts every file attempted, whether it was solved or failed, and bytes_read the
+    decompressed size of the inputs, so that throughput is comparable across formats.
+    """
+
+    files: int = 0
+    successes: int = 0
+    failures: int = 0
+    bytes_read: int = 0
+    started: float = field(default_factory=time.perf_counter)
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    @property
+    def files_per_second(self) -> float:
+        return self.files / self.elapsed
+
+    @property
+    def megabytes_per_second(self) -> float:
+        return self.bytes_read / 1e6 / self.elapsed
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    path: Path
+    answers: dict[Part, int]
+    error: str | None = None
+
+
+def read_decompressed(input_file: FilePath) -> bytes:
+    """Read a possibly compressed data file, decompressed but not decoded."""
+    with open_text(input_file) as f:
+        # Every opener wraps the decompressed bytes in a text wrapper.
+        return cast(TextIO, f).buffer.read()
+
+
+def solve_text(
+    day: int, text: str, parts: tuple[Part, ...], memoize: bool
+) -> dict[Part, int]:
+    """Parse one input once and solve the requested parts, in a worker process."""
+    solver = discover()[day]
+    parsed = solver.parse(text.splitlines(True))
+    store = ResultStore() if memoize else None
+    answers = {}
+    for part in parts:
+        part_solver = solver.solver(part)
+        if part_solver is not None:
+            answers[part] = compute_answer(parsed, part_solver, store)
+    return answers
+
+
+async def solve_batch(
+    day: int,
+    paths: Iterable[FilePath],
+    parts: tuple[Part, ...] = tuple(Part),
+    max_in_flight: int = 32,
+    executor: Executor | None = None,
+    stats: BatchStats | None = None,
+    memoize: bool = False,
+) -> AsyncIterator[BatchResult]:
+    """Solve a day for every input file, yielding results as they finish.
+
+    Parameters
+    ----------
+    day : int
+        Day of the challenge.
+    paths : Iterable[FilePath]
+        Data files to solve, possibly compressed.
+    parts : tuple[Part, ...], optional
+        Parts to solve, by default both.
+    max_in_flight : int, optional
+        How many files may be read or solved at the same time, which also bounds how many
+        inputs are held in memory, by default 32.
+    executor : Executor | None, optional
+        Where parsing and solving run, by default a ProcessPoolExecutor with a worker per
+        core.
+    stats : BatchStats | None, optional
+        Counters to update, by default a fresh BatchStats.
+    memoize : bool, optional
+        Reuse and record answers in the default ResultStore, by default False.
+
+    Yields
+    ------
+    BatchResult
+        The answers for one file, or the error that stopped it.
+    """
+    stats = BatchStats() if stats is None else stats
+    in_flight = asyncio.Semaphore(max_in_flight)
+    loop = asyncio.get_running_loop()
+    own_executor = executor is None
+    executor = ProcessPoolExecutor() if executor is None else executor
+
+    async def solve_one(path: Path) -> BatchResult:
+        async with in_flight:
+            try:
+                data = await asyncio.to_thread(read_input, path, read_decompressed)
+                stats.bytes_read += len(data)
+                answers = await loop.run_in_executor(
+                    executor, solve_text, day, data.decode(), parts, memoize
+                )
+            except Exception as exc:
+                stats.files += 1
+                stats.failures += 1
+                return BatchResult(path, {}, f"{type(exc).__name__}: {exc}")
+        stats.files += 1
+        stats.successes += 1
+        return BatchResult(path, answers)
+
+    tasks = [asyncio.create_task(solve_one(Path(path))) for path in paths]
+    try:
+        for next_result in asyncio.as_completed(tasks):
+            yield await next_result
+    finally:
+        for task in tasks:
+            task.cancel()
+        if own_executor:
+            executor.shutdown(cancel_futures=True)
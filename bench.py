@@ -0,0 +1,220 @@
+"""Benchmark every registered engine on inputs from the real data file up to millions of lines.
+
+Bigger inputs are made by repeating the real data file, or with --synthetic by the seeded
+generators in generators.py. Each measurement runs in a fresh
+process so that its peak memory is its own. Results are appended to a history file and
+compared with a saved baseline.
+
+Usage: python bench.py --days 1-4 --sizes real,1e5,1e6,1e7 [--save-baseline]
+"""
+import argparse
+import json
+import multiprocessing
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import cycle, islice
+from pathlib import Path
+
+from aoc import ROOT, discover, parse_days
+from generators import GENERATORS
+from utils import ENGINES, Part, input_path, open_text
+
+HISTORY_FILE = ROOT / "bench_history.jsonl"
+BASELINE_FILE = ROOT / "bench_baseline.json"
+
+
+def scaled_input(
+    day: int, n_lines: int | None, directory: Path, synthetic: bool = False
+) -> Path:
+    """The real data file for a day, or an input of n_lines lines.
+
+    The input repeats the real data file, or is generated if synthetic is set.
+    """
+    source = input_path(ROOT / f"day_{day:02d}.py")
+    if n_lines is None:
+        return source
+    scaled = directory / f"day_{day:02d}_{n_lines}.txt"
+    if not scaled.exists():
+        if synthetic:
+            lines = GENERATORS[day](n_lines, 0)
+        else:
+            with open_text(source) as f:
+                real_lines = [
+                    line if line.endswith("\n") else line + "\n" for line in f
+                ]
+            lines = islice(cycle(real_lines), n_lines)
+        with open(scaled, "w") as f:
+            f.writelines(lines)
+    return scaled
+
+
+def count_lines(path: Path) -> int:
+    with open_text(path) as f:
+        return sum(1 for _ in f)
+
+
+def measure(day: int, part: Part, name: str, path: Path, repeat: int) -> dict:
+    """Time one engine in this process; meant to run in a fresh worker process.
+
+    The peak memory is that of this process only, not of any workers the engine starts.
+    """
+    discover()
+    engine = ENGINES[(day, part)][name]
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        answer = engine.run(path)
+        timings.append(time.perf_counter_ns() - start)
+    peak_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {"answer": answer, "ns": min(timings), "peak_mib": peak_kib / 1024}
+
+
+def run_benchmarks(
+    days: list[int],
+    sizes: list[int | None],
+    engines: set[str] | None,
+    repeat: int,
+    directory: Path,
+    synthetic: bool = False,
+) -> tuple[list[dict], list[str]]:
+    """Measure every selected engine, carrying on past engines that raise.
+
+    Returns
+    -------
+    tuple[list[dict], list[str]]
+        The results, and a description of every measurement that failed.
+    """
+    discover()
+    context = multiprocessing.get_context("spawn")
+    results = []
+    failures = []
+    for (day, part), day_engines in sorted(ENGINES.items()):
+        if day not in days:
+            continue
+        for size in sizes:
+            path = scaled_input(day, size, directory, synthetic)
+            n_lines = count_lines(path)
+            for name in day_engines:
+                if engines is not None and name not in engines:
+                    continue
+                size_label = "real" if size is None else size
+                try:
+                    with ProcessPoolExecutor(1, mp_context=context) as executor:
+                        result = executor.submit(
+                            measure, day, part, name, path, repeat
+                        ).result()
+                except Exception as exc:
+                    failure = (
+                        f"day {day} part {part} {name} {size_label}: "
+                        f"{type(exc).__name__}: {exc}"
+                    )
+                    print(f"FAILED: {failure}")
+                    failures.append(failure)
+                    continue
+                result.update(
+                    day=day,
+                    part=int(part),
+                    engine=name,
+                    size=size_label,
+                    lines=n_lines,
+                    ns_per_line=result["ns"] / n_lines,
+                    lines_per_s=n_lines / (result["ns"] / 1e9),
+                )
+                print(
+                    f"day {day} part {part} {name:>12} {result['size']:>9} "
+                    f"{result['lines']:>9} lines {result['ns_per_line']:10.1f} ns/line "
+                    f"{result['lines_per_s']:14,.0f} lines/s "
+                    f"{result['peak_mib']:8.1f} MiB peak"
+                )
+                results.append(result)
+    return results, failures
+
+
+def _key(result: dict) -> str:
+    return f"{result['day']}/{result['part']}/{result['engine']}/{result['size']}"
+
+
+def find_regressions(
+    results: list[dict], baseline: dict[str, dict], threshold: float
+) -> list[str]:
+    """Describe every result that is more than threshold slower per line than its baseline."""
+    regressions = []
+    for result in results:
+        reference = baseline.get(_key(result))
+        if reference is None:
+            continue
+        slowdown = result["ns_per_line"] / reference["ns_per_line"] - 1
+        if slowdown > threshold:
+            regressions.append(f"{_key(result)} is {slowdown:.0%} slower than baseline")
+        if result["answer"] != reference["answer"]:
+            regressions.append(
+                f"{_key(result)} answered {result['answer']}, baseline {reference['answer']}"
+            )
+    return regressions
+
+
+def parse_size(size: str) -> int | None:
+    return None if size == "real" else int(float(size))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python bench.py")
+    parser.add_argument("--days", default="1-25", help='e.g. "1-4" or "1,3"')
+    parser.add_argument(
+        "--sizes",
+        default="real,1e5,1e6,1e7",
+        help='comma-separated line counts, "real" for the data file itself',
+    )
+    parser.add_argument("--engines", help="comma-separated engine names, default all")
+    parser.add_argument(
+        "--synthetic", action="store_true", help="generate inputs instead of repeating"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="keep the best of N runs")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="fail when ns/line grows by more than this fraction, default 0.2",
+    )
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--history", type=Path, default=HISTORY_FILE)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        results, failures = run_benchmarks(
+            parse_days(args.days),
+            [parse_size(size) for size in args.sizes.split(",")],
+            set(args.engines.split(",")) if args.engines else None,
+            args.repeat,
+            Path(directory),
+            args.synthetic,
+        )
+
+    with open(args.history, "a") as f:
+        record = {"time": time.time(), "results": results, "failures": failures}
+        f.write(json.dumps(record) + "\n")
+
+    if args.save_baseline:
+        args.baseline.write_text(
+            json.dumps({_key(result): result for result in results}, indent=2)
+        )
+        print(f"Saved baseline to {args.baseline}")
+        return 1 if failures else 0
+
+    try:
+        baseline = json.loads(args.baseline.read_text())
+    except FileNotFoundError:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+        return 1 if failures else 0
+    regressions = find_regressions(results, baseline, args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION: {regression}")
+    return 1 if regressions or failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+"""Keep the solvers warm in a long-lived process and answer requests over a Unix socket.
+
+Each request is one line of JSON, {"day": 1, "part": 1} optionally with "path" (a data file)
+or "input" (the puzzle input itself); without either, the day's own data file is used. Each
+response is one line of JSON, {"answer": ...} or {"error": ...}. A connection may carry any
+number of requests.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import socket
+import socketserver
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from aoc import discover
+from utils import Part, file_digest, input_path, read_input
+
+if TYPE_CHECKING:
+    from typing import Any
+
+    from utils import FilePath, Solver
+
+SOCKET_PATH = Path(tempfile.gettempdir()) / f"aoc-{os.getuid()}.sock"
+
+
+class SolverCache:
+    """Parsed inputs and answers kept in memory, keyed by day and input digest.
+
+    Parameters
+    ----------
+    solvers : dict[int, Solver]
+        The registered solvers.
+    max_inputs : int, optional
+        How many parsed inputs to keep before evicting the least recently used, by default 64.
+    """
+
+    def __init__(self, solvers: dict[int, Solver], max_inputs: int = 64) -> None:
+        self.solvers = solvers
+        self.max_inputs = max_inputs
+        self._parsed: OrderedDict[tuple[int, str], Any] = OrderedDict()
+        self._answers: dict[tuple[int, Part, str], int] = {}
+        self._lock = threading.Lock()
+
+    def solve(
+        self,
+        day: int,
+        part: Part,
+        path: FilePath | None = None,
+        text: str | None = None,
+    ) -> int:
+        solver = self.solvers[day]
+        part_solver = solver.solver(part)
+        if part_solver is None:
+            raise ValueError(f"Part {part} of day {day} is not solved yet")
+
+        input_file = input_path(solver.source) if path is None else Path(path)
+        if text is not None:
+            digest = hashlib.sha256(text.encode()).hexdigest()
+        else:
+            digest = file_digest(input_file)
+        with self._lock:
+            answer = self._answers.get((day, part, digest))
+            if answer is not None:
+                return answer
+            parsed = self._parsed.get((day, digest))
+            if parsed is not None:
+                self._parsed.move_to_end((day, digest))
+
+        if parsed is None:
+            lines = (
+                text.splitlines(True)
+                if text is not None
+                else read_input(input_file, "stream")
+            )
+            parsed = solver.parse(lines)
+        answer = part_solver(parsed)
+
+        with self._lock:
+            self._answers[(day, part, digest)] = answer
+            self._parsed[(day, digest)] = parsed
+            while len(self._parsed) > self.max_inputs:
+                (old_day, old_digest), _ = self._parsed.popitem(last=False)
+                for old_part in Part:
+                    self._answers.pop((old_day, old_part, old_digest), None)
+        return answer
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: _Server
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                answer = self.server.cache.solve(
+                    int(request["day"]),
+                    Part(int(request["part"])),
+                    request.get("path"),
+                    request.get("input"),
+                )
+                response: dict[str, Any] = {"answer": answer}
+            except Exception as exc:
+                response = {"error": f"{type(exc).__name__}: {exc}"}
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+            self.wfile.flush()
+
+
+class _Server(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: FilePath, cache: SolverCache) -> None:
+        self.cache = cache
+        super().__init__(str(socket_path), _Handler)
+
+
+def _remove_stale_socket(socket_path: FilePath) -> None:
+    """Remove a socket left by a daemon that is gone, exiting if one still listens there."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(str(socket_path))
+        except FileNotFoundError:
+            return
+        except ConnectionRefusedError:
+            Path(socket_path).unlink(missing_ok=True)
+            return
+    raise SystemExit(f"A daemon is already listening on {socket_path}")
+
+
+def serve(socket_path: FilePath = SOCKET_PATH) -> None:
+    """Import every day, then answer requests on socket_path until interrupted."""
+    cache = SolverCache(discover())
+    _remove_stale_socket(socket_path)
+    with _Server(socket_path, cache) as server:
+        print(f"Serving days {sorted(cache.solvers)} on {socket_path}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            Path(socket_path).unlink(missing_ok=True)
+
+
+class Client:
+    """Connection to a running daemon.
+
+    Parameters
+    ----------
+    socket_path : FilePath, optional
+        Where the daemon listens, by default SOCKET_PATH.
+    """
+
+    def __init__(self, socket_path: FilePath = SOCKET_PATH) -> None:
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.connect(str(socket_path))
+        self._file = self._socket.makefile("rwb")
+
+    def solve(
+        self,
+        day: int,
+        part: Part,
+        path: FilePath | None = None,
+        text: str | None = None,
+    ) -> int:
+        request: dict[str, Any] = {"day": day, "part": int(part)}
+        if path is not None:
+            request["path"] = str(Path(path).resolve())
+        if text is not None:
+            request["input"] = text
+        self._file.write(json.dumps(request).encode() + b"\n")
+        self._file.flush()
+        response = json.loads(self._file.readline())
+        if "error" in response:
+            raise RuntimeError(response["error"])
+        return response["answer"]
+
+    def close(self) -> None:
+        self._file.close()
+        self._socket.close()
+
+    def __enter__(self) -> Client:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
@@ -1,6 +1,43 @@
 import re
+from functools import partial
+from typing import Iterable
 
+from utils import (
+    DaySolver,
+    FilePath,
+    Part,
+    engine,
+    fold_lines,
+    input_path,
+)
 from utils import load as _load
+from utils import map_reduce, register
+
+try:
+    import numpy as np
+
+    HAS_NUMPY = True
+except ImportError:  # The numpy engines are optional.
+    HAS_NUMPY = False
+
+CALIBRATION_PATTERN_BYTES = re.compile(rb"^[^\d\n]*(\d)(?:[^\n]*(\d))?", re.MULTILINE)
+SPELLED_CALIBRATION_PATTERN_BYTES = re.compile(
+    rb"^[^\n]*?(?=(\d|one|two|three|four|five|six|seven|eight|nine))"
+    rb"[^\n]*(?=(\d|one|two|three|four|five|six|seven|eight|nine))",
+    re.MULTILINE,
+)
+SPELLED_DIGITS = {
+    "one": 1,
+    "two": 2,
+    "three": 3,
+    "four": 4,
+    "five": 5,
+    "six": 6,
+    "seven": 7,
+    "eight": 8,
+    "nine": 9,
+} | {str(digit): digit for digit in range(10)}
+SPELLED_DIGITS_BYTES = {word.encode(): digit for word, digit in SPELLED_DIGITS.items()}
 
 prompt = """--- Day 1: Trebuchet?! ---
 Something is wrong with global snow production, and you've been selected to take a look. The Elves have even given you a map; on it, they've used stars to mark the top fifty locations that are likely to be having problems.
@@ -56,7 +93,8 @@ def load() -> list[str]:
     return lines
 
 
-def solve_part_1(lines: list[str]) -> int:
+@engine(1, Part.ONE, "reference")
+def solve_part_1(lines: Iterable[str]) -> int:
     total = 0
     pattern = re.compile(r"\d")
     for line in lines:
@@ -82,7 +120,8 @@ def test_solve_part_1():
         print(f"Answer {answer} should be {solution}")
 
 
-def solve_part_2(lines: list[str]) -> int:
+@engine(1, Part.TWO, "reference")
+def solve_part_2(lines: Iterable[str]) -> int:
     pattern = re.compile(r"(?=(\d|one|two|three|four|five|six|seven|eight|nine))")
     number_maps = {
         "one": "1",
@@ -126,11 +165,226 @@ def test_solve_part_2():
         print(f"Answer {answer} should be {solution}")
 
 
+def parse(lines: Iterable[str]) -> list[str]:
+    # Both parts scan the raw text, so parsing only drops blank lines.
+    return [line for line in lines if line.strip()]
+
+
+SOLVER = register(
+    DaySolver(
+        day=1, source=__file__, parse=parse, part_1=solve_part_1, part_2=solve_part_2
+    )
+)
+
+
+def load_bytes() -> memoryview:
+    return _load(__file__, reader="bytes")
+
+
+@engine(1, Part.ONE, "bytes", reader="bytes")
+def solve_part_1_bytes(buffer: bytes | memoryview) -> int:
+    """Solve part 1 directly over the undecoded input.
+
+    Each line is matched once: the lazy prefix stops on the first digit and the greedy middle
+    backtracks to the last one.
+    """
+    total = 0
+    for match in CALIBRATION_PATTERN_BYTES.finditer(buffer):
+        first = buffer[match.start(1)] - 48
+        last_start = match.start(2)
+        last = first if last_start == -1 else buffer[last_start] - 48
+        total += 10 * first + last
+    return total
+
+
+@engine(1, Part.TWO, "bytes", reader="bytes")
+def solve_part_2_bytes(buffer: bytes | memoryview) -> int:
+    """Solve part 2 directly over the undecoded input.
+
+    Both digits are captured in lookaheads so that overlapping words like "eightwo" still
+    count twice.
+    """
+    total = 0
+    for first, last in SPELLED_CALIBRATION_PATTERN_BYTES.findall(buffer):
+        total += 10 * SPELLED_DIGITS_BYTES[first] + SPELLED_DIGITS_BYTES[last]
+    return total
+
+
+def test_solve_bytes():
+    part_1_input = b"g1abc2\npqr3stu8vwx\na1b2c3d4e5f\ntreb7uchet\n"
+    part_2_input = (
+        b"two1nine\neightwothree\nabcone2threexyz\nxtwone3four\n"
+        b"4nineeightseven2\nzoneight234\n7pqrstsixteen\n"
+    )
+    answer = solve_part_1_bytes(part_1_input)
+    assert answer == 142, f"Answer {answer} should be 142"
+    answer = solve_part_2_bytes(part_2_input)
+    assert answer == 281, f"Answer {answer} should be 281"
+
+
+def _build_scanner(words: dict[str, int]) -> list[dict[str, int]]:
+    """Build a DFA that finds the first of words to end in a text, Aho-Corasick style.
+
+    States are the proper prefixes of the words, numbered from 0 for the empty one.
+    table[state][char] is the next state, or ~value when a word ends on char; characters
+    missing from a state's dict lead back to state 0. As no word contains another, the first
+    word to end is also the first to start.
+    """
+    prefixes = sorted(
+        {word[:end] for word in words for end in range(len(word))},
+        key=lambda prefix: (len(prefix), prefix),
+    )
+    states = {prefix: state for state, prefix in enumerate(prefixes)}
+    alphabet = set("".join(words))
+    table = []
+    for prefix in prefixes:
+        row = {}
+        for char in alphabet:
+            text = prefix + char
+            ending = [value for word, value in words.items() if text.endswith(word)]
+            if ending:
+                row[char] = ~ending[0]
+                continue
+            # The longest suffix of text that may still grow into a word.
+            state = next(
+                states[text[start:]]
+                for start in range(len(text) + 1)
+                if text[start:] in states
+            )
+            if state:
+                row[char] = state
+        table.append(row)
+    return table
+
+
+FORWARD_SCANNER = _build_scanner(SPELLED_DIGITS)
+BACKWARD_SCANNER = _build_scanner(
+    {word[::-1]: digit for word, digit in SPELLED_DIGITS.items()}
+)
+
+
+def _scan(table: list[dict[str, int]], chars: Iterable[str]) -> int:
+    """Run a _build_scanner DFA over chars and return the value of the first word found."""
+    state = 0
+    for char in chars:
+        state = table[state].get(char, 0)
+        if state < 0:
+            return ~state
+    raise ValueError("No digit found")
+
+
+@engine(1, Part.TWO, "automaton")
+def solve_part_2_automaton(lines: Iterable[str]) -> int:
+    """Solve part 2 by scanning each line forward for the first digit, backward for the last.
+
+    Each scan stops on its first match, so a typical line is only read near its two ends.
+    """
+    total = 0
+    for line in lines:
+        first = _scan(FORWARD_SCANNER, line)
+        last = _scan(BACKWARD_SCANNER, reversed(line))
+        total += 10 * first + last
+    return total
+
+
+def test_solve_part_2_automaton():
+    input_data = [
+        "two1nine",
+        "eightwothree",
+        "abcone2threexyz",
+        "xtwone3four",
+        "4nineeightseven2",
+        "zoneight234",
+        "7pqrstsixteen",
+    ]
+    answer = solve_part_2_automaton(input_data)
+    assert answer == 281, f"Answer {answer} should be 281"
+    answer = solve_part_2_automaton(["eightwo", "zoneight", "oneighthreeight"])
+    assert answer == 82 + 18 + 18, f"Answer {answer} should be {82 + 18 + 18}"
+
+
+def _sum_first_last_numpy(buffer: bytes | memoryview, words: dict[str, int]) -> int:
+    """Sum 10 * first + last over the lines, the digits being words starting at a byte.
+
+    Every byte gets the value of the word starting there, or a value above 9. Words are
+    found from the bytes equal to their first letter, narrowed down by gathering each next
+    letter. The first and last values of each line are then looked up between the offsets
+    of the newlines.
+    """
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    values = data - np.uint8(ord("0"))  # Non-digits wrap around to values above 9.
+    for word, value in words.items():
+        if len(word) == 1:
+            continue
+        n_starts = max(len(data) - len(word) + 1, 0)
+        starts = np.flatnonzero(data[:n_starts] == ord(word[0]))
+        for offset, char in enumerate(word[1:], 1):
+            starts = starts[data[starts + offset] == ord(char)]
+        values[starts] = value
+
+    positions = np.flatnonzero(values < 10)
+    newlines = np.flatnonzero(data == ord("\n"))
+    firsts = np.searchsorted(positions, np.append(0, newlines + 1))
+    lasts = np.searchsorted(positions, np.append(newlines, len(data))) - 1
+    found = firsts <= lasts  # Skips blank lines.
+    return int(
+        10 * values[positions[firsts[found]]].sum(dtype=np.int64)
+        + values[positions[lasts[found]]].sum(dtype=np.int64)
+    )
+
+
+@engine(1, Part.ONE, "numpy", reader="bytes", requires="numpy")
+def solve_part_1_numpy(buffer: bytes | memoryview) -> int:
+    """Solve part 1 with array operations over the undecoded input."""
+    return _sum_first_last_numpy(buffer, {})
+
+
+@engine(1, Part.TWO, "numpy", reader="bytes", requires="numpy")
+def solve_part_2_numpy(buffer: bytes | memoryview) -> int:
+    """Solve part 2 with array operations over the undecoded input.
+
+    Overlapping words like "eightwo" start at different bytes, so both count.
+    """
+    return _sum_first_last_numpy(buffer, SPELLED_DIGITS)
+
+
+def test_solve_numpy():
+    if not HAS_NUMPY:
+        return
+    part_1_input = b"g1abc2\npqr3stu8vwx\na1b2c3d4e5f\ntreb7uchet"
+    part_2_input = (
+        b"two1nine\neightwothree\nabcone2threexyz\nxtwone3four\n"
+        b"4nineeightseven2\nzoneight234\n7pqrstsixteen\n"
+    )
+    answer = solve_part_1_numpy(part_1_input)
+    assert answer == 142, f"Answer {answer} should be 142"
+    answer = solve_part_2_numpy(part_2_input)
+    assert answer == 281, f"Answer {answer} should be 281"
+
+
+@engine(1, Part.ONE, "parallel", reader="path")
+def solve_part_1_parallel(
+    input_file: FilePath | None = None, jobs: int | None = None
+) -> int:
+    """Solve part 1 with every core, folding chunks of the data file in parallel."""
+    input_file = input_path(__file__) if input_file is None else input_file
+    return map_reduce(input_file, partial(fold_lines, solve_part_1), jobs=jobs)
+
+
+@engine(1, Part.TWO, "parallel", reader="path")
+def solve_part_2_parallel(
+    input_file: FilePath | None = None, jobs: int | None = None
+) -> int:
+    """Solve part 2 with every core, folding chunks of the data file in parallel."""
+    input_file = input_path(__file__) if input_file is None else input_file
+    return map_reduce(input_file, partial(fold_lines, solve_part_2), jobs=jobs)
+
+
 if __name__ == "__main__":
     test_solve_part_1()
-    lines = load()
-    part_1_solution = solve_part_1(lines)
-    print(f"Part 1 solution: {part_1_solution}")
     test_solve_part_2()
-    part_2_solution = solve_part_2(lines)
-    print(f"Part 2 solution: {part_2_solution}")
+    SOLVER.run(SOLVER.load())
+
+    test_solve_bytes()
+    test_solve_part_2_automaton()
+    test_solve_numpy()
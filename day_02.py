@@ -1,11 +1,53 @@
+from __future__ import annotations
+
 import argparse
+import hashlib
+import json
 import logging
+import math
+import os
 import re
-
+import tempfile
+import time
+from array import array
+from collections import Counter
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+from utils import (
+    CACHE_DIR,
+    DaySolver,
+    FilePath,
+    Part,
+    engine,
+    fold_lines,
+    input_path,
+)
 from utils import load as _load
+from utils import map_reduce, register
+
+try:
+    import numpy as np
+
+    HAS_NUMPY = True
+except ImportError:  # The numpy engines are optional.
+    HAS_NUMPY = False
+
+if TYPE_CHECKING:
+    from numpy.typing import ArrayLike, NDArray
 
 logger = logging.getLogger(__name__)
 
+# Totals over every call of parse, and of sum_possible_game_ids while DEBUG is enabled for
+# this logger, updated once per call. Detailed messages are only built when DEBUG is on.
+COUNTERS: Counter[str] = Counter()
+
+PARSER_VERSION = 2
+
+GAME_PATTERN_BYTES = re.compile(rb"^Game (\d+):([^\n]*)", re.MULTILINE)
+CUBES_PATTERN_BYTES = re.compile(rb"(\d+) (red|green|blue)")
+
 prompt = """
 --- Day 2: Cube Conundrum ---
 You're launched high into the atmosphere! The apex of your trajectory just barely reaches the surface of a large island floating in the sky. You gently land in a fluffy pile of leaves. It's quite cold, but you don't see much snow. An Elf runs over to greet you.
@@ -69,7 +111,8 @@ def load() -> list[str]:
     return lines
 
 
-def solve_part_1(lines: list[str]) -> int:
+@engine(2, Part.ONE, "reference")
+def solve_part_1(lines: Iterable[str]) -> int:
     max_red = 12
     max_green = 13
     max_blue = 14
@@ -77,6 +120,7 @@ def solve_part_1(lines: list[str]) -> int:
     n_blue_pattern = re.compile(r"(\d+)(?: blue)")
     n_red_pattern = re.compile(r"(\d+)(?: red)")
     n_green_pattern = re.compile(r"(\d+)(?: green)")
+    trace = logger.isEnabledFor(logging.DEBUG)
     valid_ids_sum = 0
     for line in lines:
         game_id_str, all_game_results = line.split(":")
@@ -91,7 +135,8 @@ def solve_part_1(lines: list[str]) -> int:
             n_blue_match = re.search(n_blue_pattern, subset)
             if n_blue_match is not None:
                 n_blue = int(n_blue_match.groups()[0])
-                logger.debug("found {} blue in game {}".format(n_blue, game_id))
+                if trace:
+                    logger.debug("found %d blue in game %d", n_blue, game_id)
 
                 if n_blue > max_blue:
                     break
@@ -99,27 +144,32 @@ def solve_part_1(lines: list[str]) -> int:
             n_red_match = re.search(n_red_pattern, subset)
             if n_red_match is not None:
                 n_red = int(n_red_match.groups()[0])
-                logger.debug("found {} blue in game {}".format(n_red, game_id))
+                if trace:
+                    logger.debug("found %d red in game %d", n_red, game_id)
                 if n_red > max_red:
                     break
 
             n_green_match = re.search(n_green_pattern, subset)
             if n_green_match is not None:
                 n_green = int(n_green_match.groups()[0])
-                logger.debug("found {} blue in game {}".format(n_green, game_id))
+                if trace:
+                    logger.debug("found %d green in game %d", n_green, game_id)
                 if n_green > max_green:
                     break
         else:
-            logger.debug("Adding game ID {} to sum".format(game_id))
+            if trace:
+                logger.debug("Adding game ID %d to sum", game_id)
             valid_ids_sum += game_id
     return valid_ids_sum
 
 
-def solve_part_2(lines: list[str]) -> int:
+@engine(2, Part.TWO, "reference")
+def solve_part_2(lines: Iterable[str]) -> int:
     game_id_pattern = re.compile(r"(?:Game )(\d+)")
     n_blue_pattern = re.compile(r"(\d+)(?: blue)")
     n_red_pattern = re.compile(r"(\d+)(?: red)")
     n_green_pattern = re.compile(r"(\d+)(?: green)")
+    trace = logger.isEnabledFor(logging.DEBUG)
     final_sum = 0
     for line in lines:
         game_id_str, all_game_results = line.split(":")
@@ -136,19 +186,22 @@ def solve_part_2(lines: list[str]) -> int:
             n_blue_match = re.search(n_blue_pattern, subset)
             if n_blue_match is not None:
                 n_blue = int(n_blue_match.groups()[0])
-                logger.debug("found {} blue in game {}".format(n_blue, game_id))
+                if trace:
+                    logger.debug("found %d blue in game %d", n_blue, game_id)
                 min_blue = max(n_blue, min_blue)
 
             n_red_match = re.search(n_red_pattern, subset)
             if n_red_match is not None:
                 n_red = int(n_red_match.groups()[0])
-                logger.debug("found {} blue in game {}".format(n_red, game_id))
+                if trace:
+                    logger.debug("found %d red in game %d", n_red, game_id)
                 min_red = max(n_red, min_red)
 
             n_green_match = re.search(n_green_pattern, subset)
             if n_green_match is not None:
                 n_green = int(n_green_match.groups()[0])
-                logger.debug("found {} blue in game {}".format(n_green, game_id))
+                if trace:
+                    logger.debug("found %d green in game %d", n_green, game_id)
                 min_green = max(n_green, min_green)
         game_power = min_blue * min_red * min_green
         final_sum += game_power
@@ -182,18 +235,479 @@ def test_solve_part_2():
     assert solution == answer, f"Answer {answer} should be {solution}"
 
 
+# Games are parsed into flat records of four unsigned ints each.
+RECORD_SIZE = 4
+COLOUR_SLOTS = {"r": 1, "g": 2, "b": 3}
+
+
+def parse(lines: Iterable[str]) -> array:
+    """Reduce every game to a (game_id, max_red, max_green, max_blue) record.
+
+    Each line is tokenized once on whitespace: "Game", "<id>:", then pairs of a count and a
+    colour, the colour maybe followed by "," or ";". Subsets are only counted when DEBUG is
+    enabled, since that takes another pass over each line.
+    """
+    trace = logger.isEnabledFor(logging.DEBUG)
+    records = array("I")
+    n_games = n_subsets = 0
+    for line in lines:
+        tokens = line.split()
+        if not tokens:
+            continue
+        record = [int(tokens[1][:-1]), 0, 0, 0]
+        for index in range(2, len(tokens), 2):
+            n_cubes = int(tokens[index])
+            slot = COLOUR_SLOTS[tokens[index + 1][0]]
+            if n_cubes > record[slot]:
+                record[slot] = n_cubes
+        if trace:
+            logger.debug(
+                "found at most %d red, %d green and %d blue in game %d",
+                record[1],
+                record[2],
+                record[3],
+                record[0],
+            )
+            n_subsets += line.count(";") + 1
+        records.extend(record)
+        n_games += 1
+    COUNTERS["games_parsed"] += n_games
+    if trace:
+        COUNTERS["subsets_scanned"] += n_subsets
+    return records
+
+
+def iter_games(records: array) -> Iterator[tuple[int, int, int, int]]:
+    return zip(*(records[slot::RECORD_SIZE] for slot in range(RECORD_SIZE)))
+
+
+def sum_possible_game_ids(
+    records: array,
+    max_red: int = 12,
+    max_green: int = 13,
+    max_blue: int = 14,
+) -> int:
+    if logger.isEnabledFor(logging.DEBUG):
+        return _trace_possible_game_ids(records, max_red, max_green, max_blue)
+    return sum(
+        game_id
+        for game_id, n_red, n_green, n_blue in iter_games(records)
+        if n_red <= max_red and n_green <= max_green and n_blue <= max_blue
+    )
+
+
+def _trace_possible_game_ids(
+    records: array, max_red: int, max_green: int, max_blue: int
+) -> int:
+    """sum_possible_game_ids, logging the IDs added and counting the games ruled out."""
+    valid_ids_sum = 0
+    n_ruled_out = 0
+    for game_id, n_red, n_green, n_blue in iter_games(records):
+        if n_red <= max_red and n_green <= max_green and n_blue <= max_blue:
+            logger.debug("Adding game ID %d to sum", game_id)
+            valid_ids_sum += game_id
+        else:
+            n_ruled_out += 1
+    COUNTERS["games_ruled_out"] += n_ruled_out
+    return valid_ids_sum
+
+
+def sum_game_powers(records: array) -> int:
+    return sum(
+        n_red * n_green * n_blue for _, n_red, n_green, n_blue in iter_games(records)
+    )
+
+
+SOLVER = register(
+    DaySolver(
+        day=2,
+        source=__file__,
+        parse=parse,
+        part_1=sum_possible_game_ids,
+        part_2=sum_game_powers,
+        parser_version=PARSER_VERSION,
+    )
+)
+
+
+def test_parsed():
+    input_ = [
+        "Game 1: 3 blue, 4 red; 1 red, 2 green, 6 blue; 2 green",
+        "Game 2: 1 blue, 2 green; 3 green, 4 blue, 1 red; 1 green, 1 blue",
+        "Game 3: 8 green, 6 blue, 20 red; 5 blue, 4 red, 13 green; 5 green, 1 red",
+        "Game 4: 1 green, 3 red, 6 blue; 3 green, 6 red; 3 green, 15 blue, 14 red",
+        "Game 5: 6 red, 1 blue, 3 green; 2 blue, 1 red, 2 green",
+    ]
+    games = parse(input_)
+    answer = sum_possible_game_ids(games)
+    assert answer == 8, f"Answer {answer} should be 8"
+    answer = sum_game_powers(games)
+    assert answer == 2286, f"Answer {answer} should be 2286"
+
+
+def load_bytes() -> memoryview:
+    return _load(__file__, reader="bytes")
+
+
+def _game_maxima_bytes(buffer: bytes | memoryview):
+    """Yield (game_id, max_red, max_green, max_blue) for every game in the raw input."""
+    for game in GAME_PATTERN_BYTES.finditer(buffer):
+        maxima = {b"red": 0, b"green": 0, b"blue": 0}
+        for n_cubes, colour in CUBES_PATTERN_BYTES.findall(
+            buffer, game.start(2), game.end(2)
+        ):
+            maxima[colour] = max(maxima[colour], int(n_cubes))
+        yield int(game.group(1)), maxima[b"red"], maxima[b"green"], maxima[b"blue"]
+
+
+@engine(2, Part.ONE, "bytes", reader="bytes")
+def solve_part_1_bytes(buffer: bytes | memoryview) -> int:
+    max_red = 12
+    max_green = 13
+    max_blue = 14
+    valid_ids_sum = 0
+    for game_id, n_red, n_green, n_blue in _game_maxima_bytes(buffer):
+        if n_red <= max_red and n_green <= max_green and n_blue <= max_blue:
+            valid_ids_sum += game_id
+    return valid_ids_sum
+
+
+@engine(2, Part.TWO, "bytes", reader="bytes")
+def solve_part_2_bytes(buffer: bytes | memoryview) -> int:
+    return sum(
+        n_red * n_green * n_blue
+        for _, n_red, n_green, n_blue in _game_maxima_bytes(buffer)
+    )
+
+
+def test_solve_bytes():
+    input_ = (
+        b"Game 1: 3 blue, 4 red; 1 red, 2 green, 6 blue; 2 green\n"
+        b"Game 2: 1 blue, 2 green; 3 green, 4 blue, 1 red; 1 green, 1 blue\n"
+        b"Game 3: 8 green, 6 blue, 20 red; 5 blue, 4 red, 13 green; 5 green, 1 red\n"
+        b"Game 4: 1 green, 3 red, 6 blue; 3 green, 6 red; 3 green, 15 blue, 14 red\n"
+        b"Game 5: 6 red, 1 blue, 3 green; 2 blue, 1 red, 2 green\n"
+    )
+    answer = solve_part_1_bytes(input_)
+    assert answer == 8, f"Answer {answer} should be 8"
+    answer = solve_part_2_bytes(input_)
+    assert answer == 2286, f"Answer {answer} should be 2286"
+
+
+@engine(2, Part.ONE, "parallel", reader="path")
+def solve_part_1_parallel(
+    input_file: FilePath | None = None, jobs: int | None = None
+) -> int:
+    """Solve part 1 with every core, folding chunks of the data file in parallel."""
+    input_file = input_path(__file__) if input_file is None else input_file
+    return map_reduce(input_file, partial(fold_lines, solve_part_1), jobs=jobs)
+
+
+@engine(2, Part.TWO, "parallel", reader="path")
+def solve_part_2_parallel(
+    input_file: FilePath | None = None, jobs: int | None = None
+) -> int:
+    """Solve part 2 with every core, folding chunks of the data file in parallel."""
+    input_file = input_path(__file__) if input_file is None else input_file
+    return map_reduce(input_file, partial(fold_lines, solve_part_2), jobs=jobs)
+
+
+class GameColumns:
+    """Game IDs and per-colour maxima as numpy columns, to test many bags at once.
+
+    The ID sums are also laid out in a cube indexed by the distinct maxima of each colour,
+    then summed cumulatively along every axis. The games possible with a bag are those whose
+    maxima are all at most its contents, so their ID sum is one cell of the cube, found by
+    binary search of the bag's contents among the distinct maxima.
+
+    The cube grows with the product of the distinct counts, so past max_cube_cells it is
+    not built, and bags are instead compared with every game's maxima, a block of bags at
+    a time to keep the comparison within max_cube_cells too.
+
+    Parameters
+    ----------
+    records : array
+        Game records, as returned by parse.
+    """
+
+    __slots__ = ("ids", "maxima", "levels", "cube")
+
+    max_cube_cells = 2**22
+
+    def __init__(self, records: array) -> None:
+        columns = np.frombuffer(records, dtype=np.uintc).reshape(-1, RECORD_SIZE)
+        self.ids: NDArray = columns[:, 0].astype(np.int64)
+        self.maxima: NDArray = columns[:, 1:].astype(np.int64)
+        self.levels = [np.unique(self.maxima[:, colour]) for colour in range(3)]
+        shape = tuple(len(levels) for levels in self.levels)
+        self.cube: NDArray | None = None
+        if math.prod(shape) > self.max_cube_cells:
+            return
+        cells = np.ravel_multi_index(
+            [
+                np.searchsorted(levels, self.maxima[:, colour])
+                for colour, levels in enumerate(self.levels)
+            ],
+            shape,
+        )
+        # bincount would sum float64 weights, which are inexact past 2**53.
+        cube = np.zeros(math.prod(shape), dtype=np.int64)
+        np.add.at(cube, cells, self.ids)
+        cube = cube.reshape(shape)
+        for axis in range(3):
+            np.cumsum(cube, axis=axis, out=cube)
+        self.cube = cube
+
+    def possible_id_sums(self, bags: ArrayLike) -> NDArray:
+        """Sum the IDs of the games possible with each (red, green, blue) bag.
+
+        Parameters
+        ----------
+        bags : ArrayLike
+            Bag contents, shaped (n_bags, 3).
+
+        Returns
+        -------
+        NDArray
+            The sum for each bag, shaped (n_bags,).
+        """
+        bags = np.asarray(bags, dtype=np.int64).reshape(-1, 3)
+        if self.cube is None:
+            block_size = max(1, self.max_cube_cells // (3 * len(self.ids)))
+            return np.concatenate(
+                [
+                    (self.maxima <= block[:, None]).all(axis=2) @ self.ids
+                    for block in np.array_split(
+                        bags, range(block_size, len(bags), block_size)
+                    )
+                ]
+            )
+        cells = np.stack(
+            [
+                np.searchsorted(levels, bags[:, colour], side="right") - 1
+                for colour, levels in enumerate(self.levels)
+            ]
+        )
+        # A bag with fewer cubes of a colour than every game allows none of them.
+        possible = (cells >= 0).all(axis=0)
+        sums = np.zeros(len(bags), dtype=np.int64)
+        sums[possible] = self.cube[tuple(cells[:, possible])]
+        return sums
+
+    def power_sum(self) -> int:
+        return int(self.maxima.prod(axis=1).sum())
+
+
+@engine(2, Part.ONE, "numpy", reader="stream", requires="numpy")
+def solve_part_1_numpy(lines: Iterable[str]) -> int:
+    return int(GameColumns(parse(lines)).possible_id_sums([(12, 13, 14)])[0])
+
+
+@engine(2, Part.TWO, "numpy", reader="stream", requires="numpy")
+def solve_part_2_numpy(lines: Iterable[str]) -> int:
+    return GameColumns(parse(lines)).power_sum()
+
+
+def test_game_columns():
+    if not HAS_NUMPY:
+        return
+    input_ = [
+        "Game 1: 3 blue, 4 red; 1 red, 2 green, 6 blue; 2 green",
+        "Game 2: 1 blue, 2 green; 3 green, 4 blue, 1 red; 1 green, 1 blue",
+        "Game 3: 8 green, 6 blue, 20 red; 5 blue, 4 red, 13 green; 5 green, 1 red",
+        "Game 4: 1 green, 3 red, 6 blue; 3 green, 6 red; 3 green, 15 blue, 14 red",
+        "Game 5: 6 red, 1 blue, 3 green; 2 blue, 1 red, 2 green",
+    ]
+    columns = GameColumns(parse(input_))
+    answer = columns.possible_id_sums([(12, 13, 14), (20, 13, 15), (0, 0, 0)]).tolist()
+    assert answer == [8, 15, 0], f"Answer {answer} should be [8, 15, 0]"
+    answer = columns.power_sum()
+    assert answer == 2286, f"Answer {answer} should be 2286"
+
+
+def test_game_columns_wide():
+    """Games with thousands of distinct counts, whose cube would not fit in memory."""
+    if not HAS_NUMPY:
+        return
+    from generators import generate_day_02
+
+    records = parse(generate_day_02(300, 0, max_cubes=3000))
+    columns = GameColumns(records)
+    assert columns.cube is None, "The cube should be past max_cube_cells"
+    bags = [(n_cubes, n_cubes, 3000 - n_cubes) for n_cubes in range(0, 3001, 100)]
+    answer = columns.possible_id_sums(bags).tolist()
+    expected = [sum_possible_game_ids(records, *bag) for bag in bags]
+    assert answer == expected, f"Answer {answer} should be {expected}"
+
+
+def checkpoint_path(input_file: FilePath) -> Path:
+    """Default checkpoint file of a game log, in CACHE_DIR and named after its path."""
+    name = hashlib.sha256(str(Path(input_file).resolve()).encode()).hexdigest()[:16]
+    return CACHE_DIR / "follow" / f"day_02-{name}.json"
+
+
+def update(
+    input_file: FilePath,
+    checkpoint_file: FilePath | None = None,
+    block_size: int = 2**20,
+) -> dict:
+    """Bring both answers up to date with the lines appended to a game log since last time.
+
+    The checkpoint holds the offset up to which the log was read, the length and SHA-256 of
+    the last line read, and the answers so far. The log is read in blocks, and only whole
+    lines are parsed: the rest of a block is carried over to the next one, and a line still
+    being written is read on the next update. If the log was replaced, or truncated so that
+    the last line read is no longer where it was, it is read again from the start.
+
+    Parameters
+    ----------
+    input_file : FilePath
+        The game log, an uncompressed file only ever appended to.
+    checkpoint_file : FilePath | None, optional
+        Where the checkpoint persists between runs, by default checkpoint_path(input_file).
+    block_size : int, optional
+        How many bytes to read at a time, by default 1 MiB.
+
+    Returns
+    -------
+    dict
+        The checkpoint, with the answers as "possible_id_sum" and "power_sum".
+    """
+    checkpoint_file = Path(
+        checkpoint_path(input_file) if checkpoint_file is None else checkpoint_file
+    )
+    try:
+        checkpoint = json.loads(checkpoint_file.read_text())
+    except (OSError, ValueError):
+        checkpoint = {}
+
+    with open(input_file, "rb") as f:
+        status = os.fstat(f.fileno())
+        resume = (
+            checkpoint.get("inode") == status.st_ino
+            and "last_line_sha256" in checkpoint
+            and checkpoint["offset"] <= status.st_size
+        )
+        if resume:
+            f.seek(checkpoint["offset"] - checkpoint["last_line_length"])
+            last_line = f.read(checkpoint["last_line_length"])
+            resume = (
+                hashlib.sha256(last_line).hexdigest() == checkpoint["last_line_sha256"]
+            )
+        if not resume:
+            checkpoint = {
+                "inode": status.st_ino,
+                "offset": 0,
+                "last_line_length": 0,
+                "last_line_sha256": hashlib.sha256().hexdigest(),
+                "possible_id_sum": 0,
+                "power_sum": 0,
+            }
+
+        f.seek(checkpoint["offset"])
+        offset = checkpoint["offset"]
+        carried = b""
+        while block := f.read(block_size):
+            block = carried + block
+            end = block.rfind(b"\n") + 1
+            carried = block[end:]
+            if not end:
+                continue
+            records = parse(block[:end].decode().splitlines())
+            checkpoint["possible_id_sum"] += sum_possible_game_ids(records)
+            checkpoint["power_sum"] += sum_game_powers(records)
+            last_line = block[block.rfind(b"\n", 0, end - 1) + 1 : end]
+            checkpoint["last_line_length"] = len(last_line)
+            checkpoint["last_line_sha256"] = hashlib.sha256(last_line).hexdigest()
+            offset += end
+    if offset == checkpoint["offset"] and resume:
+        return checkpoint
+
+    checkpoint["offset"] = offset
+    checkpoint_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = checkpoint_file.with_suffix(f".{os.getpid()}.tmp")
+    tmp_file.write_text(json.dumps(checkpoint))
+    tmp_file.replace(checkpoint_file)
+    return checkpoint
+
+
+def follow(
+    input_file: FilePath,
+    checkpoint_file: FilePath | None = None,
+    interval: float = 1.0,
+) -> None:
+    """Print both answers for a growing game log whenever they change, until interrupted."""
+    last_offset = None
+    try:
+        while True:
+            checkpoint = update(input_file, checkpoint_file)
+            if checkpoint["offset"] != last_offset:
+                last_offset = checkpoint["offset"]
+                print(
+                    f"{last_offset} bytes: part 1 {checkpoint['possible_id_sum']}, "
+                    f"part 2 {checkpoint['power_sum']}"
+                )
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+
+
+def test_update():
+    with tempfile.TemporaryDirectory() as directory:
+        log = Path(directory) / "games.txt"
+        checkpoint_file = Path(directory) / "checkpoint.json"
+        log.write_text(
+            "Game 1: 3 blue, 4 red; 1 red, 2 green, 6 blue; 2 green\n"
+            "Game 2: 1 blue, 2 green; 3 green, 4 blue, 1 red; 1 green, 1 blue\n"
+            "Game 3: 8 green, 6 blue, 20 red; 5 blue, 4 red"
+        )
+        checkpoint = update(log, checkpoint_file)
+        assert checkpoint["possible_id_sum"] == 3, checkpoint
+        with open(log, "a") as f:
+            f.write(
+                ", 13 green; 5 green, 1 red\n"
+                "Game 4: 1 green, 3 red, 6 blue; 3 green, 6 red; 3 green, 15 blue, 14 red\n"
+                "Game 5: 6 red, 1 blue, 3 green; 2 blue, 1 red, 2 green\n"
+            )
+        checkpoint = update(log, checkpoint_file)
+        assert checkpoint["possible_id_sum"] == 8, checkpoint
+        assert checkpoint["power_sum"] == 2286, checkpoint
+        log.write_text("Game 1: 3 blue, 4 red\n")
+        checkpoint = update(log, checkpoint_file)
+        assert checkpoint["possible_id_sum"] == 1, checkpoint
+        # Truncated in place and grown back past the old offset, with other games.
+        log.write_text("Game 2: 1 blue, 2 green\nGame 3: 9 red\nGame 4: 20 green\n")
+        checkpoint = update(log, checkpoint_file, block_size=16)
+        assert checkpoint["possible_id_sum"] == 5, checkpoint
+        assert checkpoint["power_sum"] == 0, checkpoint
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--debug", "-d", action="store_true")
+    parser.add_argument(
+        "--follow",
+        nargs="?",
+        const=input_path(__file__),
+        metavar="LOG",
+        help="keep solving a growing game log, by default the data file",
+    )
     args = parser.parse_args()
     if args.debug:
         logging.basicConfig(level=logging.DEBUG)
+    if args.follow is not None:
+        follow(args.follow)
+        raise SystemExit
 
     test_solve_part_1()
-    lines = load()
-    part_1_solution = solve_part_1(lines)
-    print(f"Part 1 solution: {part_1_solution}")
-
     test_solve_part_2()
-    part_2_solution = solve_part_2(lines)
-    print(f"Part 2 solution: {part_2_solution}")
+    test_parsed()
+    # Only count the real input, which SOLVER.load may take from the parse cache.
+    COUNTERS.clear()
+    SOLVER.run(SOLVER.load())
+    logger.debug("counters: %s", dict(COUNTERS))
+
+    test_solve_bytes()
+    test_game_columns()
+    test_game_columns_wide()
+    test_update()
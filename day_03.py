@@ -1,8 +1,40 @@
 import re
+from array import array
+from bisect import bisect_right
 from itertools import product
-from typing import Sequence
-
+from typing import Iterable, Iterator
+
+from utils import (
+    Chunk,
+    DaySolver,
+    FilePath,
+    Grid,
+    Part,
+    engine,
+    input_path,
+)
 from utils import load as _load
+from utils import map_reduce, register
+
+try:
+    import numpy as np
+
+    HAS_NUMPY = True
+except ImportError:  # The numpy engines are optional.
+    HAS_NUMPY = False
+
+PARSER_VERSION = 1
+NUMBER_PATTERN = re.compile(r"\d+")
+SYMBOL_PATTERN = re.compile(r"[^.\d\s]")
+
+# Numbers as (row, start, end, value) and symbols as (row, column, symbol).
+Schematic = tuple[list[tuple[int, int, int, int]], list[tuple[int, int, str]]]
+
+NUMBER_PATTERN_BYTES = re.compile(rb"\d+")
+GEAR_PATTERN_BYTES = re.compile(rb"\*")
+SYMBOL_PATTERN_BYTES = re.compile(rb"[^.\d\s]")
+NEWLINE_PATTERN_BYTES = re.compile(rb"\n")
+NOT_SYMBOLS_BYTES = frozenset(b".0123456789\r\n")
 
 prompt = """--- Day 3: Gear Ratios ---
 You and the Elf eventually reach a gondola lift station; he says the gondola lift will take you up to the water source, but this is as far as he can bring you. You go inside.
@@ -75,101 +107,45 @@ def load() -> list[str]:
     return lines
 
 
-def _check_line(
-    line: str,
-    num_span: tuple[int, int],
-    check_ahead: bool,
-    check_behind: bool,
-    normal_symbol: str = ".",
-) -> bool:
-    if check_behind:
-        start = num_span[0] - 1
-    else:
-        start = num_span[0]
-
-    if check_ahead:
-        end = num_span[1]
-    else:
-        end = num_span[1] - 1
-    for char in line[start : end + 1]:
-        if char != normal_symbol:
-            return True
-    return False
-
-
-def _is_number_adjacent_to_symbol(
-    number: re.Match,
-    above_line: str | None,
-    current_line: str,
-    below_line: str | None,
-    normal_symbol: str = ".",
-) -> bool:
-    """Determine if a number is adjacent to a non-period symbol.
-
-    Parameters
-    ----------
-    number : re.Match
-        match object for number
-    above_line : str | None
-        string for line above number
-    current_line : str
-        string for line that number is in
-    below_line : str | None
-        string for line below number
-
-    Returns
-    -------
-    bool
-        Answer
-    """
-
-    span = number.span()
-    check_behind = bool(span[0])  # False if 0
-    check_ahead = span[1] != len(current_line) - 1
-
-    if check_behind:
-        if current_line[span[0] - 1] != normal_symbol:
-            return True
-    if check_ahead:
-        if current_line[span[1]] != normal_symbol:
-            return True
-    if above_line:
-        above_has_symbol = _check_line(above_line, span, check_ahead, check_behind)
-        if above_has_symbol:
-            return True
-    if below_line:
-        below_has_symbol = _check_line(below_line, span, check_ahead, check_behind)
-        if below_has_symbol:
-            return True
-    return False
-
-
-def solve_part_1(lines: Sequence[str]) -> int:
-    pattern = re.compile(r"\d+")
+@engine(3, Part.ONE, "reference")
+def solve_part_1(lines: Iterable[str]) -> int:
+    grid = Grid(lines)
     part_numbers = []
-    n_lines = len(lines)
-    for ind in range(n_lines):
-        if ind == 0:
-            above_line = None
-        else:
-            above_line = lines[ind - 1]
-        current_line = lines[ind]
-
-        if ind == n_lines - 1:
-            below_line = None
-        else:
-            below_line = lines[ind + 1]
-
-        numbers_in_current_line = re.finditer(pattern, current_line)
-        for number in numbers_in_current_line:
-            is_part_number = _is_number_adjacent_to_symbol(
-                number, above_line, current_line, below_line
+    for number in grid.runs(NUMBER_PATTERN_BYTES):
+        start, end = number.span()
+        # The cells from the one before the number to the one after it, on all three rows.
+        is_part_number = any(
+            SYMBOL_PATTERN_BYTES.search(
+                grid.cells, start - 1 + offset, end + 1 + offset
             )
-            if is_part_number:
-                part_numbers.append(int(number.group()))
+            for offset in (-grid.stride, 0, grid.stride)
+        )
+        if is_part_number:
+            part_numbers.append(int(number.group()))
     return sum(part_numbers)
 
 
+def test_grid():
+    grid = Grid(["467\n", "..*\n", "35"])
+    assert (grid.width, grid.height, grid.stride) == (3, 3, 5)
+    # A border of sentinels all around, and the short last row padded with them.
+    assert grid.cells == b"....." b".467." b"...*." b".35.." b"....."
+    assert grid.lines() == ["467", "..*", "35."]
+    # Neighbours go row by row from the top left, reaching into the border at the edges.
+    neighbours = bytes(grid.cells[index] for index in grid.neighbours(grid.index(1, 1)))
+    assert neighbours == b"467.*35.", neighbours
+    neighbours = bytes(grid.cells[index] for index in grid.neighbours(grid.index(0, 0)))
+    assert neighbours == b"....6...", neighbours
+    neighbours = bytes(grid.cells[index] for index in grid.neighbours(grid.index(2, 2)))
+    assert neighbours == b".*.5....", neighbours
+    try:
+        grid.index(3, 0)
+    except IndexError:
+        pass
+    else:
+        raise AssertionError("Cell (3, 0) should be outside the grid")
+
+
 def test_solve_part_1():
     input_ = (
         "467..114..\n"
@@ -188,85 +164,27 @@ def test_solve_part_1():
     assert solution == answer, f"Answer {answer} should be {solution}"
 
 
-def _get_adjacent_numbers(
-    coords: tuple[int, int],
-    numbers: dict[tuple[int, int], re.Match],
-    n_lines: int,
-    line_length: int,
-) -> list[int]:
-    if coords[0] == 0:
-        check_behind = False
-    else:
-        check_behind = True
-
-    if coords[0] == line_length - 1:
-        check_ahead = False
-    else:
-        check_ahead = True
+@engine(3, Part.TWO, "reference")
+def solve_part_2(lines: Iterable[str]) -> int:
+    grid = Grid(lines)
 
-    if coords[1] == 0:
-        check_above = False
-    else:
-        check_above = True
+    # The digit runs are numbered in reading order: every cell holds the ID of its run, or
+    # -1 outside numbers, and run_values holds the number of every ID.
+    run_ids = array("i", [-1]) * len(grid.cells)
+    run_values = array("q")
+    for number in grid.runs(NUMBER_PATTERN_BYTES):
+        start, end = number.span()
+        run_ids[start:end] = array("i", [len(run_values)]) * (end - start)
+        run_values.append(int(number.group()))
 
-    if coords[1] == n_lines - 1:
-        check_below = False
-    else:
-        check_below = True
-
-    locations_to_check: list[tuple[int, int]] = []
-
-    if check_above:
-        locations_to_check.append((coords[0], coords[1] - 1))
-    if check_below:
-        locations_to_check.append((coords[0], coords[1] + 1))
-
-    if check_behind:
-        locations_to_check.append((coords[0] - 1, coords[1]))
-        if check_above:
-            locations_to_check.append((coords[0] - 1, coords[1] - 1))
-        if check_below:
-            locations_to_check.append((coords[0] - 1, coords[1] + 1))
-    if check_ahead:
-        locations_to_check.append((coords[0] + 1, coords[1]))
-        if check_above:
-            locations_to_check.append((coords[0] + 1, coords[1] - 1))
-        if check_below:
-            locations_to_check.append((coords[0] + 1, coords[1] + 1))
-
-    adjacent_numbers: list[int] = []
-    for location in locations_to_check:
-        if location in numbers:
-            num = int(numbers[location].group())
-            adjacent_numbers.append(num)
-
-    return list(set(adjacent_numbers))
-
-
-def solve_part_2(lines: Sequence[str]) -> int:
-    num_pattern = re.compile(r"\d+")
-    n_lines = len(lines)
-    line_length = len(lines[0])
-
-    numbers: dict[tuple[int, int], re.Match] = {}
-    for i, line in enumerate(lines):
-        numbers_in_line = list(re.finditer(num_pattern, line))
-        for number in numbers_in_line:
-            span = number.span()
-            all_coords = product(range(*span), [i])
-            for coords in all_coords:
-                numbers[coords] = number
-    # numbers = {i: list(re.finditer(num_pattern, line)) for i, line in enumerate(lines)}
     gear_ratios = 0
-    for i, line in enumerate(lines):
-        for j, char in enumerate(line):
-            if char == "*":
-                coords = (j, i)
-                adjacent_numbers = _get_adjacent_numbers(
-                    coords, numbers, n_lines, line_length
-                )
-                if len(adjacent_numbers) == 2:
-                    gear_ratios += adjacent_numbers[0] * adjacent_numbers[1]
+    for gear in grid.runs(GEAR_PATTERN_BYTES):
+        # Dedupe by run rather than value, so that equal neighbours both count.
+        adjacent_runs = {run_ids[index] for index in grid.neighbours(gear.start())}
+        adjacent_runs.discard(-1)
+        if len(adjacent_runs) == 2:
+            first, second = adjacent_runs
+            gear_ratios += run_values[first] * run_values[second]
 
     return gear_ratios
 
@@ -289,12 +207,560 @@ def test_solve_part_2():
     assert solution == answer, f"Answer {answer} should be {solution}"
 
 
+def parse(lines: Iterable[str]) -> Schematic:
+    numbers = []
+    symbols = []
+    for row, line in enumerate(lines):
+        for number in NUMBER_PATTERN.finditer(line):
+            numbers.append((row, number.start(), number.end(), int(number.group())))
+        for symbol in SYMBOL_PATTERN.finditer(line):
+            symbols.append((row, symbol.start(), symbol.group()))
+    return numbers, symbols
+
+
+def sum_part_numbers(schematic: Schematic) -> int:
+    numbers, symbols = schematic
+    symbol_cells = {(row, column) for row, column, _ in symbols}
+    total = 0
+    for row, start, end, value in numbers:
+        if any(
+            (neighbour_row, column) in symbol_cells
+            for neighbour_row in (row - 1, row, row + 1)
+            for column in range(start - 1, end + 1)
+        ):
+            total += value
+    return total
+
+
+def sum_gear_ratios(schematic: Schematic) -> int:
+    numbers, symbols = schematic
+    # Cells point at the index of their number so that equal values stay distinct.
+    number_cells = {
+        (row, column): index
+        for index, (row, start, end, _) in enumerate(numbers)
+        for column in range(start, end)
+    }
+    gear_ratios = 0
+    for row, column, symbol in symbols:
+        if symbol != "*":
+            continue
+        adjacent = {
+            number_cells[cell]
+            for cell in product(
+                (row - 1, row, row + 1), (column - 1, column, column + 1)
+            )
+            if cell in number_cells
+        }
+        if len(adjacent) == 2:
+            first, second = adjacent
+            gear_ratios += numbers[first][3] * numbers[second][3]
+    return gear_ratios
+
+
+SOLVER = register(
+    DaySolver(
+        day=3,
+        source=__file__,
+        parse=parse,
+        part_1=sum_part_numbers,
+        part_2=sum_gear_ratios,
+        parser_version=PARSER_VERSION,
+    )
+)
+
+
+def test_parsed():
+    input_ = (
+        "467..114..\n"
+        "...*......\n"
+        "..35..633.\n"
+        "......#...\n"
+        "617*......\n"
+        ".....+.58.\n"
+        "..592.....\n"
+        "......755.\n"
+        "...$.*....\n"
+        ".664.598..\n"
+    ).split("\n")
+    schematic = parse(input_)
+    answer = sum_part_numbers(schematic)
+    assert answer == 4361, f"Answer {answer} should be 4361"
+    answer = sum_gear_ratios(schematic)
+    assert answer == 467835, f"Answer {answer} should be 467835"
+
+
+def load_bytes() -> memoryview:
+    return _load(__file__, reader="bytes")
+
+
+def _stride(buffer: bytes | memoryview) -> int:
+    """Distance between vertically adjacent cells, newline included."""
+    newline = NEWLINE_PATTERN_BYTES.search(buffer)
+    return len(buffer) + 1 if newline is None else newline.end()
+
+
+def _is_digit_run(buffer: bytes | memoryview, position: int) -> bool:
+    """Whether the cells at position and position + 1 are both digits."""
+    return 48 <= buffer[position] <= 57 and 48 <= buffer[position + 1] <= 57
+
+
+@engine(3, Part.ONE, "bytes", reader="bytes")
+def solve_part_1_bytes(buffer: bytes | memoryview) -> int:
+    """Solve part 1 over the undecoded schematic, addressing cells by flat offset."""
+    stride = _stride(buffer)
+    size = len(buffer)
+    total = 0
+    for number in NUMBER_PATTERN_BYTES.finditer(buffer):
+        start, end = number.span()
+        row_start = start - start % stride
+        left = max(start - 1, row_start)
+        right = min(end + 1, row_start + stride - 1)
+        for offset in (-stride, 0, stride):
+            if not 0 <= left + offset < size:
+                continue
+            window = buffer[left + offset : min(right + offset, size)]
+            if any(byte not in NOT_SYMBOLS_BYTES for byte in window):
+                total += int(number.group())
+                break
+    return total
+
+
+@engine(3, Part.TWO, "bytes", reader="bytes")
+def solve_part_2_bytes(buffer: bytes | memoryview) -> int:
+    """Solve part 2 over the undecoded schematic, addressing cells by flat offset."""
+    stride = _stride(buffer)
+    size = len(buffer)
+    gear_ratios = 0
+    for gear in GEAR_PATTERN_BYTES.finditer(buffer):
+        position = gear.start()
+        row_start = position - position % stride
+        left = max(position - 1, row_start)
+        right = min(position + 2, row_start + stride - 1)
+        adjacent_numbers: list[int] = []
+        for offset in (-stride, 0, stride):
+            if not 0 <= left + offset < size:
+                continue
+            # Widen the window to whole digit runs so the regex sees complete numbers.
+            start = left + offset
+            while start > row_start + offset and _is_digit_run(buffer, start - 1):
+                start -= 1
+            end = min(right + offset, size)
+            while end < size and _is_digit_run(buffer, end - 1):
+                end += 1
+            adjacent_numbers.extend(
+                int(number.group())
+                for number in NUMBER_PATTERN_BYTES.finditer(buffer, start, end)
+            )
+        if len(adjacent_numbers) == 2:
+            gear_ratios += adjacent_numbers[0] * adjacent_numbers[1]
+    return gear_ratios
+
+
+def test_solve_bytes():
+    input_ = (
+        b"467..114..\n"
+        b"...*......\n"
+        b"..35..633.\n"
+        b"......#...\n"
+        b"617*......\n"
+        b".....+.58.\n"
+        b"..592.....\n"
+        b"......755.\n"
+        b"...$.*....\n"
+        b".664.598..\n"
+    )
+    answer = solve_part_1_bytes(input_)
+    assert answer == 4361, f"Answer {answer} should be 4361"
+    answer = solve_part_2_bytes(input_)
+    assert answer == 467835, f"Answer {answer} should be 467835"
+
+
+def _sum_part_numbers_in_chunk(chunk: Chunk) -> int:
+    numbers, symbols = parse(chunk.before + chunk.lines + chunk.after)
+    first_row, end_row = len(chunk.before), len(chunk.before) + len(chunk.lines)
+    own_numbers = [number for number in numbers if first_row <= number[0] < end_row]
+    return sum_part_numbers((own_numbers, symbols))
+
+
+def _sum_gear_ratios_in_chunk(chunk: Chunk) -> int:
+    numbers, symbols = parse(chunk.before + chunk.lines + chunk.after)
+    first_row, end_row = len(chunk.before), len(chunk.before) + len(chunk.lines)
+    own_symbols = [symbol for symbol in symbols if first_row <= symbol[0] < end_row]
+    return sum_gear_ratios((numbers, own_symbols))
+
+
+@engine(3, Part.ONE, "parallel", reader="path")
+def solve_part_1_parallel(
+    input_file: FilePath | None = None, jobs: int | None = None
+) -> int:
+    """Solve part 1 with every core, giving each chunk one row of context on either side."""
+    input_file = input_path(__file__) if input_file is None else input_file
+    return map_reduce(input_file, _sum_part_numbers_in_chunk, halo=1, jobs=jobs)
+
+
+@engine(3, Part.TWO, "parallel", reader="path")
+def solve_part_2_parallel(
+    input_file: FilePath | None = None, jobs: int | None = None
+) -> int:
+    """Solve part 2 with every core, giving each chunk one row of context on either side."""
+    input_file = input_path(__file__) if input_file is None else input_file
+    return map_reduce(input_file, _sum_gear_ratios_in_chunk, halo=1, jobs=jobs)
+
+
+def _label_numpy(buffer: bytes | memoryview):
+    """Label the digit runs of a schematic, for the numpy engines.
+
+    Returns
+    -------
+    tuple
+        The cells as a flat uint8 array with a newline ending every row, the stride between
+        rows, the offsets of the digit cells, the run ID of each of them (1 for the first
+        run, 2 for the next, ...) and the value of every run ID, 0 standing for no run.
+    """
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    if len(data) and data[-1] != ord("\n"):
+        data = np.append(data, np.uint8(ord("\n")))
+    stride = _stride(buffer)
+    if len(data) % stride:
+        raise ValueError("Rows of the schematic differ in width")
+
+    # Every row ends with a newline, so runs never continue onto the next row.
+    positions = np.flatnonzero((data >= ord("0")) & (data <= ord("9")))
+    run_starts = np.ones(len(positions), dtype=bool)
+    run_starts[1:] = positions[1:] - positions[:-1] > 1
+    runs = np.cumsum(run_starts, dtype=np.int32)
+
+    # Each digit contributes digit * 10**(its distance to the end of its run).
+    first_digits = np.flatnonzero(run_starts)
+    run_ends = np.append(positions[first_digits[1:] - 1], positions[-1:])
+    places = run_ends[runs - 1] - positions
+    contributions = (data[positions] - ord("0")).astype(np.int64) * 10**places
+    values = np.zeros(len(first_digits) + 1, dtype=np.int64)
+    if len(positions):
+        values[1:] = np.add.reduceat(contributions, first_digits)
+    return data, stride, positions, runs, values
+
+
+def _shift(cells, offset: int):
+    """cells moved so that shifted[i] == cells[i + offset], with zeros from outside."""
+    shifted = np.zeros_like(cells)
+    if offset >= 0:
+        shifted[: len(cells) - offset] = cells[offset:]
+    else:
+        shifted[-offset:] = cells[:offset]
+    return shifted
+
+
+@engine(3, Part.ONE, "numpy", reader="bytes", requires="numpy")
+def solve_part_1_numpy(buffer: bytes | memoryview) -> int:
+    """Solve part 1 by dilating the symbol mask over 3x3 cells and reducing over the runs."""
+    data, stride, positions, runs, values = _label_numpy(buffer)
+    is_symbol = (data != ord(".")) & (data != ord("\n")) & (data != ord("\r"))
+    is_symbol &= (data < ord("0")) | (data > ord("9"))
+    near_symbol = is_symbol | _shift(is_symbol, -1) | _shift(is_symbol, 1)
+    near_symbol |= _shift(near_symbol, -stride) | _shift(near_symbol, stride)
+    is_part = np.zeros(len(values), dtype=bool)
+    is_part[runs[near_symbol[positions]]] = True
+    return int(values[is_part].sum())
+
+
+@engine(3, Part.TWO, "numpy", reader="bytes", requires="numpy")
+def solve_part_2_numpy(buffer: bytes | memoryview) -> int:
+    """Solve part 2 from the run IDs around each gear, deduplicated by sorting them."""
+    data, stride, positions, runs, values = _label_numpy(buffer)
+    gears = np.flatnonzero(data == ord("*"))
+    if not len(positions):
+        return 0
+    # The digit cells among the three next to a gear on a row are at most the three digit
+    # cells from the first one at or after the leftmost. Each row of queries is sorted,
+    # which searchsorted is fastest at.
+    lefts = gears - 1 + np.array([[-stride], [0], [stride]])
+    found = np.searchsorted(positions, lefts)
+    neighbour_rows = []
+    for step in range(3):
+        indices = np.minimum(found + step, len(positions) - 1)
+        inside = (lefts <= positions[indices]) & (positions[indices] <= lefts + 2)
+        neighbour_rows.append(np.where(inside, runs[indices], 0))
+    neighbours = np.concatenate(neighbour_rows).T
+
+    neighbours.sort(axis=1)
+    distinct = neighbours > 0
+    distinct[:, 1:] &= neighbours[:, 1:] != neighbours[:, :-1]
+    is_gear = distinct.sum(axis=1) == 2
+    ratios = np.where(distinct, values[neighbours], 1)[is_gear].prod(axis=1)
+    return int(ratios.sum())
+
+
+def test_solve_numpy():
+    if not HAS_NUMPY:
+        return
+    input_ = (
+        b"467..114..\n"
+        b"...*......\n"
+        b"..35..633.\n"
+        b"......#...\n"
+        b"617*......\n"
+        b".....+.58.\n"
+        b"..592.....\n"
+        b"......755.\n"
+        b"...$.*....\n"
+        b".664.598.."
+    )
+    answer = solve_part_1_numpy(input_)
+    assert answer == 4361, f"Answer {answer} should be 4361"
+    answer = solve_part_2_numpy(input_)
+    assert answer == 467835, f"Answer {answer} should be 467835"
+
+
+def _windows[T](rows: Iterable[T], edge: T) -> Iterator[tuple[T, T, T]]:
+    """Yield every row with the rows above and below it, holding three rows at a time.
+
+    Rows past the top and bottom of the schematic are edge.
+    """
+    above, row, started = edge, edge, False
+    for below in rows:
+        if started:
+            yield above, row, below
+            above = row
+        row, started = below, True
+    if started:
+        yield above, row, edge
+
+
+@engine(3, Part.ONE, "streaming", reader="stream")
+def solve_part_1_streaming(lines: Iterable[str]) -> int:
+    """Solve part 1 over rows from any iterator, in memory proportional to the width."""
+    total = 0
+    for above, row, below in _windows(lines, ""):
+        for number in NUMBER_PATTERN.finditer(row):
+            start, end = max(number.start() - 1, 0), number.end() + 1
+            if any(
+                SYMBOL_PATTERN.search(line, start, end) for line in (above, row, below)
+            ):
+                total += int(number.group())
+    return total
+
+
+def _row_numbers(
+    lines: Iterable[str],
+) -> Iterator[tuple[str, list[int], list[tuple[int, int]]]]:
+    """Pair every row with the starts of its numbers and their (end, value)."""
+    for line in lines:
+        numbers = list(NUMBER_PATTERN.finditer(line))
+        yield (
+            line,
+            [number.start() for number in numbers],
+            [(number.end(), int(number.group())) for number in numbers],
+        )
+
+
+@engine(3, Part.TWO, "streaming", reader="stream")
+def solve_part_2_streaming(lines: Iterable[str]) -> int:
+    """Solve part 2 over rows from any iterator, in memory proportional to the width.
+
+    Numbers are apart, so at most two in a row touch the three cells around a gear: the
+    last two starting at or before its right neighbour.
+    """
+    gear_ratios = 0
+    for window in _windows(_row_numbers(lines), ("", [], [])):
+        row = window[1][0]
+        column = row.find("*")
+        while column != -1:
+            adjacent: list[int] = []
+            for _, starts, numbers in window:
+                before = bisect_right(starts, column + 1)
+                adjacent.extend(
+                    value
+                    for end, value in numbers[max(before - 2, 0) : before]
+                    if end >= column
+                )
+            if len(adjacent) == 2:
+                gear_ratios += adjacent[0] * adjacent[1]
+            column = row.find("*", column + 1)
+    return gear_ratios
+
+
+def test_solve_streaming():
+    input_ = (
+        "467..114..\n"
+        "...*......\n"
+        "..35..633.\n"
+        "......#...\n"
+        "617*......\n"
+        ".....+.58.\n"
+        "..592.....\n"
+        "......755.\n"
+        "...$.*....\n"
+        ".664.598..\n"
+    ).splitlines(True)
+    answer = solve_part_1_streaming(iter(input_))
+    assert answer == 4361, f"Answer {answer} should be 4361"
+    answer = solve_part_2_streaming(iter(input_))
+    assert answer == 467835, f"Answer {answer} should be 467835"
+
+
+# A digit run as the flat indices of its first cell and of the cell after it.
+Run = tuple[int, int]
+
+
+class IncrementalSchematic:
+    """A schematic whose part number and gear ratio sums stay current as cells change.
+
+    Editing a cell can only change the digit runs within the 3x3 cells around it, and the
+    gears next to those runs or to it. set_cells finds them on the grid after the edits,
+    and before them by briefly undoing the edits, then swaps their old contributions to the
+    sums for their new ones.
+
+    Parameters
+    ----------
+    lines : Iterable[str]
+        Rows of the schematic, padded with "." to the widest one.
+    """
+
+    __slots__ = ("grid", "part_number_sum", "gear_ratio_sum")
+
+    def __init__(self, lines: Iterable[str]) -> None:
+        self.grid = Grid(lines)
+        self.part_number_sum = sum(
+            self._part_number(number.span())
+            for number in self.grid.runs(NUMBER_PATTERN_BYTES)
+        )
+        self.gear_ratio_sum = sum(
+            self._gear_ratio(gear.start())
+            for gear in self.grid.runs(GEAR_PATTERN_BYTES)
+        )
+
+    def set_cell(self, x: int, y: int, char: str) -> None:
+        """Write char at column x of row y."""
+        self.set_cells([(x, y, char)])
+
+    def set_cells(self, edits: Iterable[tuple[int, int, str]]) -> None:
+        """Write every (x, y, char) in order, updating the sums once for all of them."""
+        writes = [(self.grid.index(x, y), ord(char)) for x, y, char in edits]
+        cells = [index for index, _ in writes]
+
+        old_runs = self._runs_near(cells)
+        undo = self._write(writes)
+        new_runs = self._runs_near(cells)
+        gears = self._gears_near(old_runs | new_runs, cells)
+        new_part_numbers = sum(map(self._part_number, new_runs))
+        new_gear_ratios = sum(map(self._gear_ratio, gears))
+        self._write(undo)
+        old_part_numbers = sum(map(self._part_number, old_runs))
+        old_gear_ratios = sum(map(self._gear_ratio, gears))
+        self._write(writes)
+
+        self.part_number_sum += new_part_numbers - old_part_numbers
+        self.gear_ratio_sum += new_gear_ratios - old_gear_ratios
+
+    def _write(self, writes: list[tuple[int, int]]) -> list[tuple[int, int]]:
+        """Write bytes to cells, returning the writes that undo it."""
+        cells = self.grid.cells
+        undo = []
+        for index, byte in writes:
+            undo.append((index, cells[index]))
+            cells[index] = byte
+        undo.reverse()
+        return undo
+
+    def _run_at(self, index: int) -> Run | None:
+        cells = self.grid.cells
+        if not 48 <= cells[index] <= 57:
+            return None
+        # The border stops both loops.
+        start, end = index, index + 1
+        while 48 <= cells[start - 1] <= 57:
+            start -= 1
+        while 48 <= cells[end] <= 57:
+            end += 1
+        return start, end
+
+    def _runs_near(self, cells: Iterable[int]) -> set[Run]:
+        runs = set()
+        for index in cells:
+            for neighbour in (index, *self.grid.neighbours(index)):
+                run = self._run_at(neighbour)
+                if run is not None:
+                    runs.add(run)
+        return runs
+
+    def _gears_near(self, runs: Iterable[Run], cells: Iterable[int]) -> set[int]:
+        """Every cell whose gear ratio may depend on runs or on cells."""
+        near = set(cells)
+        for start, end in runs:
+            near.update(range(start, end))
+        around = set(near)
+        for index in near:
+            around.update(self.grid.neighbours(index))
+        return around
+
+    def _part_number(self, run: Run) -> int:
+        start, end = run
+        cells, stride = self.grid.cells, self.grid.stride
+        for offset in (-stride, 0, stride):
+            if SYMBOL_PATTERN_BYTES.search(cells, start - 1 + offset, end + 1 + offset):
+                return int(cells[start:end])
+        return 0
+
+    def _gear_ratio(self, index: int) -> int:
+        if self.grid.cells[index] != ord("*"):
+            return 0
+        runs = self._runs_near([index])
+        if len(runs) != 2:
+            return 0
+        first, second = (int(self.grid.cells[start:end]) for start, end in runs)
+        return first * second
+
+
+@engine(3, Part.ONE, "incremental", reader="stream")
+def solve_part_1_incremental(lines: Iterable[str]) -> int:
+    return IncrementalSchematic(lines).part_number_sum
+
+
+@engine(3, Part.TWO, "incremental", reader="stream")
+def solve_part_2_incremental(lines: Iterable[str]) -> int:
+    return IncrementalSchematic(lines).gear_ratio_sum
+
+
+def test_incremental_schematic():
+    input_ = (
+        "467..114..\n"
+        "...*......\n"
+        "..35..633.\n"
+        "......#...\n"
+        "617*......\n"
+        ".....+.58.\n"
+        "..592.....\n"
+        "......755.\n"
+        "...$.*....\n"
+        ".664.598..\n"
+    ).splitlines(True)
+    schematic = IncrementalSchematic(input_)
+    assert schematic.part_number_sum == 4361, schematic.part_number_sum
+    assert schematic.gear_ratio_sum == 467835, schematic.gear_ratio_sum
+
+    # Removing the first gear drops 467 and 35 and their ratio.
+    schematic.set_cell(3, 1, ".")
+    assert schematic.part_number_sum == 4361 - 467 - 35, schematic.part_number_sum
+    assert schematic.gear_ratio_sum == 467835 - 467 * 35, schematic.gear_ratio_sum
+
+    # Joining 617 and the gear next to it, splitting 467 and moving a symbol.
+    schematic.set_cells(
+        [(3, 4, "1"), (1, 0, "."), (3, 1, "*"), (6, 3, "."), (9, 9, "#")]
+    )
+    rebuilt = IncrementalSchematic(schematic.grid.lines())
+    assert schematic.part_number_sum == rebuilt.part_number_sum
+    assert schematic.gear_ratio_sum == rebuilt.gear_ratio_sum
+
+
 if __name__ == "__main__":
+    test_grid()
     test_solve_part_1()
-    lines = load()
-    part_1_solution = solve_part_1(lines)
-    print(f"Part 1 solution: {part_1_solution}")
-
     test_solve_part_2()
-    part_2_solution = solve_part_2(lines)
-    print(f"Part 2 solution: {part_2_solution}")
+    test_parsed()
+    SOLVER.run(SOLVER.load())
+
+    test_solve_bytes()
+    test_solve_numpy()
+    test_solve_streaming()
+    test_incremental_schematic()
@@ -1,9 +1,24 @@
 import re
-from typing import Sequence
-
-from utils import Part
+from collections import deque
+from functools import partial
+from typing import Iterable, Iterator
+
+from utils import (
+    DaySolver,
+    FilePath,
+    Part,
+    engine,
+    fold_lines,
+    input_path,
+)
 from utils import load as _load
-from utils import solve, test_solve
+from utils import map_reduce, register, test_solve
+
+PARSER_VERSION = 1
+NUMBER_PATTERN = re.compile(r"\d+")
+
+CARD_PATTERN_BYTES = re.compile(rb"^Card +\d+:([^|\n]*)\|([^\n]*)", re.MULTILINE)
+NUMBER_PATTERN_BYTES = re.compile(rb"\d+")
 
 prompt = """--- Day 4: Scratchcards ---
 
@@ -89,7 +104,8 @@ def load() -> list[str]:
     return lines
 
 
-def solve_part_1(input_: Sequence[str]) -> int:
+@engine(4, Part.ONE, "reference")
+def solve_part_1(input_: Iterable[str]) -> int:
     number_pattern = re.compile(r"\d+")
     total_worth = 0
     for line in input_:
@@ -110,15 +126,134 @@ def test_solve_part_1():
     test_solve(TEST_INPUT, solve_part_1, Part(1), 13)
 
 
-def solve_part_2():
-    ...
+def iter_matches(input_: Iterable[str]) -> Iterator[int]:
+    """Yield the number of matches of every card as it is read."""
+    for line in input_:
+        if not line.strip():
+            continue
+        winning_numbers_str, my_numbers_str = line.split("|")
+        _, winning_numbers_str = winning_numbers_str.split(":")
+        winning_numbers = set(NUMBER_PATTERN.findall(winning_numbers_str))
+        my_numbers = NUMBER_PATTERN.findall(my_numbers_str)
+        yield len(winning_numbers.intersection(my_numbers))
+
+
+def parse(input_: Iterable[str]) -> list[int]:
+    """Reduce every card to its number of matches, which is all both parts need."""
+    return list(iter_matches(input_))
+
+
+def total_worth(matches: Iterable[int]) -> int:
+    return sum(2 ** (n_matches - 1) for n_matches in matches if n_matches)
+
+
+def count_cards(matches: Iterable[int]) -> int:
+    """Count the original and won scratchcards, reading each card's matches once.
+
+    A card with c copies and m matches adds c copies to each of the next m cards. Rather
+    than adding to all of them, the increase is recorded as a change of c at the next card
+    and of -c after the last one, in a buffer that only reaches as far ahead as the largest
+    number of matches.
+    """
+    n_cards = 0
+    won = 0  # Copies of the current card won from earlier ones.
+    changes: deque[int] = deque()  # Changes of won at the next cards.
+    for n_matches in matches:
+        if changes:
+            won += changes.popleft()
+        copies = 1 + won
+        n_cards += copies
+        if n_matches:
+            if len(changes) <= n_matches:
+                changes.extend([0] * (n_matches + 1 - len(changes)))
+            changes[0] += copies
+            changes[n_matches] -= copies
+    return n_cards
+
+
+SOLVER = register(
+    DaySolver(
+        day=4,
+        source=__file__,
+        parse=parse,
+        part_1=total_worth,
+        part_2=count_cards,
+        parser_version=PARSER_VERSION,
+    )
+)
+
+
+def test_solver():
+    SOLVER.test(TEST_INPUT, {Part.ONE: 13, Part.TWO: 30})
+
+
+def load_bytes() -> memoryview:
+    return _load(__file__, reader="bytes")
+
+
+@engine(4, Part.ONE, "bytes", reader="bytes")
+def solve_part_1_bytes(buffer: bytes | memoryview) -> int:
+    """Solve part 1 over the undecoded input, comparing numbers as byte strings."""
+    total_worth = 0
+    for card in CARD_PATTERN_BYTES.finditer(buffer):
+        winning_numbers = set(
+            NUMBER_PATTERN_BYTES.findall(buffer, card.start(1), card.end(1))
+        )
+        my_numbers = NUMBER_PATTERN_BYTES.findall(buffer, card.start(2), card.end(2))
+        n_matches = len(winning_numbers.intersection(my_numbers))
+        if n_matches:
+            total_worth += 2 ** (n_matches - 1)
+    return total_worth
+
+
+def test_solve_part_1_bytes():
+    test_solve("\n".join(TEST_INPUT).encode(), solve_part_1_bytes, Part(1), 13)
+
+
+@engine(4, Part.ONE, "parallel", reader="path")
+def solve_part_1_parallel(
+    input_file: FilePath | None = None, jobs: int | None = None
+) -> int:
+    """Solve part 1 with every core, folding chunks of the data file in parallel."""
+    input_file = input_path(__file__) if input_file is None else input_file
+    return map_reduce(input_file, partial(fold_lines, solve_part_1), jobs=jobs)
+
+
+@engine(4, Part.TWO, "reference")
+def solve_part_2(input_: Iterable[str]) -> int:
+    number_pattern = re.compile(r"\d+")
+    lines = [line for line in input_ if line.strip()]
+    card_counts = [1] * len(lines)
+    for card_index, line in enumerate(lines):
+        winning_numbers_str, my_numbers_str = line.split("|")
+        _, winning_numbers_str = winning_numbers_str.split(":")
+        winning_numbers = set(map(int, re.findall(number_pattern, winning_numbers_str)))
+        my_numbers = set(map(int, re.findall(number_pattern, my_numbers_str)))
+        n_matches = len(my_numbers.intersection(winning_numbers))
+        for won_index in range(card_index + 1, card_index + 1 + n_matches):
+            card_counts[won_index] += card_counts[card_index]
+    return sum(card_counts)
 
 
 def test_solve_part_2():
-    ...
+    test_solve(TEST_INPUT, solve_part_2, Part(2), 30)
+
+
+@engine(4, Part.TWO, "streaming", reader="stream")
+def solve_part_2_streaming(input_: Iterable[str]) -> int:
+    """Solve part 2 as the cards stream in, in memory bounded by the largest match count."""
+    return count_cards(iter_matches(input_))
+
+
+def test_solve_part_2_streaming():
+    test_solve(TEST_INPUT, solve_part_2_streaming, Part(2), 30)
 
 
 if __name__ == "__main__":
     test_solve_part_1()
-    input_ = load()
-    solve(input_, solve_part_1, Part(1))
+    test_solve_part_2()
+    test_solve_part_2_streaming()
+    test_solver()
+    SOLVER.run(SOLVER.load())
+
+    test_solve_part_1_bytes()
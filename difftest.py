@@ -0,0 +1,66 @@
+"""Check every engine against the reference solve_part_* functions on generated inputs.
+
+Usage: python difftest.py --days 1-4 --seeds 20 --lines 2000
+"""
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+
+from aoc import discover, parse_days
+from generators import GENERATORS
+from utils import ENGINES, Part
+
+
+def check_engines(day: int, part: Part, input_file: Path) -> list[str]:
+    """Describe every engine whose answer differs from the reference one."""
+    engines = dict(ENGINES[(day, part)])
+    expected = engines.pop("reference").run(input_file)
+    mismatches = []
+    for name, engine in engines.items():
+        try:
+            answer = engine.run(input_file)
+        except Exception as exc:
+            mismatches.append(f"{name} raised {type(exc).__name__}: {exc}")
+            continue
+        if answer != expected:
+            mismatches.append(f"{name} answered {answer}, reference {expected}")
+    return mismatches
+
+
+def run_difftest(days: list[int], seeds: int, n_lines: int, directory: Path) -> int:
+    """Run every check and return the number of mismatches."""
+    discover()
+    failures = 0
+    for (day, part), engines in sorted(ENGINES.items()):
+        if day not in days or day not in GENERATORS or "reference" not in engines:
+            continue
+        for seed in range(seeds):
+            input_file = directory / f"day_{day:02d}_{seed}.txt"
+            if not input_file.exists():
+                with open(input_file, "w") as f:
+                    f.writelines(GENERATORS[day](n_lines, seed))
+            for mismatch in check_engines(day, part, input_file):
+                print(f"day {day} part {part} seed {seed}: {mismatch}")
+                failures += 1
+        print(f"day {day} part {part}: checked {len(engines) - 1} engines")
+    return failures
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python difftest.py")
+    parser.add_argument("--days", default="1-25", help='e.g. "1-4" or "1,3"')
+    parser.add_argument("--seeds", type=int, default=10, help="inputs per day")
+    parser.add_argument("--lines", type=int, default=1000, help="lines per input")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        failures = run_difftest(
+            parse_days(args.days), args.seeds, args.lines, Path(directory)
+        )
+    print(f"{failures} mismatches")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
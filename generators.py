@@ -0,0 +1,131 @@
+"""Seeded generators of realistic puzzle inputs of any size.
+
+Every generator yields lines with their trailing newline, like f.readlines() would.
+"""
+import random
+from typing import Callable, Iterator
+
+SPELLED_DIGITS = [
+    "one",
+    "two",
+    "three",
+    "four",
+    "five",
+    "six",
+    "seven",
+    "eight",
+    "nine",
+]
+# Spelled digits sharing letters, where both digits count.
+OVERLAPPING_DIGITS = [
+    "oneight",
+    "twone",
+    "threeight",
+    "fiveight",
+    "sevenine",
+    "eightwo",
+]
+LETTERS = "abcdefghijklmnopqrstuvwxyz"
+SYMBOLS = "*#+$/@=%&-"
+# How often a card has 0, 1, ... 10 matches in the real day 4 input.
+MATCH_WEIGHTS = [39, 33, 20, 23, 9, 9, 8, 7, 8, 9, 34]
+
+
+def generate_day_01(n_lines: int, seed: int = 0, max_tokens: int = 8) -> Iterator[str]:
+    """Calibration lines mixing letters, digits, spelled digits and overlapping words."""
+    rng = random.Random(seed)
+    for _ in range(n_lines):
+        tokens = [str(rng.randint(1, 9))]  # Part 1 needs at least one digit per line.
+        for _ in range(rng.randint(0, max_tokens)):
+            kind = rng.random()
+            if kind < 0.3:
+                tokens.append(str(rng.randint(1, 9)))
+            elif kind < 0.6:
+                tokens.append(rng.choice(SPELLED_DIGITS))
+            elif kind < 0.7:
+                tokens.append(rng.choice(OVERLAPPING_DIGITS))
+            else:
+                tokens.append("".join(rng.choices(LETTERS, k=rng.randint(1, 6))))
+        rng.shuffle(tokens)
+        yield "".join(tokens) + "\n"
+
+
+def generate_day_02(
+    n_games: int, seed: int = 0, max_subsets: int = 6, max_cubes: int = 20
+) -> Iterator[str]:
+    """Game N: records of up to max_subsets subsets, each colour at most once per subset."""
+    rng = random.Random(seed)
+    colours = ["red", "green", "blue"]
+    for game_id in range(1, n_games + 1):
+        subsets = []
+        for _ in range(rng.randint(1, max_subsets)):
+            shown = rng.sample(colours, rng.randint(1, 3))
+            subsets.append(
+                ", ".join(f"{rng.randint(1, max_cubes)} {colour}" for colour in shown)
+            )
+        yield f"Game {game_id}: {'; '.join(subsets)}\n"
+
+
+def generate_day_03(
+    height: int,
+    seed: int = 0,
+    width: int = 140,
+    number_density: float = 0.1,
+    symbol_density: float = 0.03,
+    gear_share: float = 0.4,
+) -> Iterator[str]:
+    """Schematic rows with 1-3 digit numbers and symbols, a gear_share of which are *."""
+    rng = random.Random(seed)
+    for _ in range(height):
+        row = ["."] * width
+        column = 0
+        while column < width:
+            if rng.random() < number_density:
+                number = str(rng.randint(1, 999))[: width - column]
+                row[column : column + len(number)] = number
+                column += len(number) + 1  # Keep numbers apart.
+            elif rng.random() < symbol_density:
+                row[column] = "*" if rng.random() < gear_share else rng.choice(SYMBOLS)
+                column += 1
+            else:
+                column += 1
+        yield "".join(row) + "\n"
+
+
+def generate_day_04(
+    n_cards: int,
+    seed: int = 0,
+    n_winning: int = 10,
+    n_mine: int = 25,
+    block_size: int = 40,
+) -> Iterator[str]:
+    """Fixed-width Card N: rows of distinct two-digit numbers, as in the real input.
+
+    The matches follow the real input, and taper off at the end of every block of
+    cards, like the real input ends with cards of no matches, so that no card wins
+    copies past the end. Blocks are then independent, and the number of cards grows
+    linearly with n_cards instead of exponentially.
+    """
+    rng = random.Random(seed)
+    id_width = len(str(n_cards))
+    for card_id in range(1, n_cards + 1):
+        cards_left = min(n_cards - card_id, block_size - 1 - (card_id - 1) % block_size)
+        n_matches = min(rng.choices(range(11), MATCH_WEIGHTS)[0], n_winning, cards_left)
+        winning = rng.sample(range(1, 100), n_winning)
+        others = sorted(set(range(1, 100)).difference(winning))
+        mine = rng.sample(winning, n_matches) + rng.sample(others, n_mine - n_matches)
+        rng.shuffle(mine)
+        yield (
+            f"Card {card_id:>{id_width}}: "
+            f"{' '.join(f'{n:>2}' for n in winning)} | "
+            f"{' '.join(f'{n:>2}' for n in mine)}\n"
+        )
+
+
+# Generators by day, called with the number of lines and a seed.
+GENERATORS: dict[int, Callable[[int, int], Iterator[str]]] = {
+    1: generate_day_01,
+    2: generate_day_02,
+    3: generate_day_03,
+    4: generate_day_04,
+}
@@ -1,14 +1,47 @@
 from __future__ import annotations
 
+import bz2
+import cProfile
+import fcntl
+import gzip
+import hashlib
+import importlib.util
+import json
+import lzma
+import marshal
+import mmap
+import os
+import queue
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
 from enum import IntEnum
+from functools import cache, partial
+from itertools import chain, islice, repeat
 from pathlib import Path
-from typing import TYPE_CHECKING, Callable, overload
+from types import CodeType, FunctionType, ModuleType, NoneType
+from typing import TYPE_CHECKING, Callable, NamedTuple, Protocol, overload
 
 if TYPE_CHECKING:
-    from typing import Any, Callable, Literal
+    from typing import IO, Any, Callable, Iterable, Iterator, Literal
 
 FilePath = Path | str
 
+CACHE_DIR = Path(__file__).parent / ".aoc_cache"
+
+# Compressed siblings of a data file, tried in order when the plain .txt file is missing.
+_OPENERS: dict[str, Callable[..., IO[Any]]] = {
+    ".gz": gzip.open,
+    ".xz": lzma.open,
+    ".bz2": bz2.open,
+}
+
 
 class Part(IntEnum):
     ONE = 1
@@ -25,55 +58,921 @@ def load(filename: FilePath, reader: Literal["all"]) -> str:
     ...
 
 
+@overload
+def load(filename: FilePath, reader: Literal["mmap"]) -> mmap.mmap | bytes:
+    ...
+
+
+@overload
+def load(filename: FilePath, reader: Literal["bytes"]) -> memoryview:
+    ...
+
+
+@overload
+def load(filename: FilePath, reader: Literal["stream"]) -> Iterator[str]:
+    ...
+
+
 @overload
 def load[T](filename: FilePath, reader: Callable[[FilePath], T]) -> T:
     ...
 
 
 def load(
-    filename: FilePath, reader: Callable[[FilePath], Any] | Literal["lines", "all"]
+    filename: FilePath,
+    reader: Callable[[FilePath], Any]
+    | Literal["lines", "all", "mmap", "bytes", "stream"],
 ) -> Any:
     """Load data for challenge.
 
     This function assumes that the data file will have the same name as the source code file
     except for a .txt extension instead of a .py and that it will live in a directory called
-    data that is in the same directory as teh source code file.
+    data that is in the same directory as teh source code file. If that file is missing, a
+    .txt.gz, .txt.xz or .txt.bz2 sibling is decompressed while it is read (see input_path).
 
     Parameters
     ----------
     filename : FilePath
         The name of the source code file.
-    reader : Callable[[FilePath], Any] | Literal["lines", "all"]
+    reader : Callable[[FilePath], Any] | Literal["lines", "all", "mmap", "bytes", "stream"]
         How to read the data file. If "lines," will use f.readlines. If "all." will use f.read().
-        If a callable, will use that function to read the data.
+        If "mmap," will return a read-only memory map of the raw bytes, or b"" for an empty
+        file, which cannot be mapped. If "bytes," will return a read-only memoryview over that
+        map. Neither decodes nor copies the file. If "stream,"
+        will return an iterator over lines that are read ahead in batches by read_ahead. If a
+        callable, will use that function to read the data.
 
     Returns
     -------
     Any
         _description_
     """
+    return read_input(input_path(filename), reader)
+
+
+def input_path(filename: FilePath) -> Path:
+    """Find the data file for a source code file.
+
+    The plain data/<stem>.txt file wins; otherwise the first existing .txt.gz, .txt.xz or
+    .txt.bz2 sibling is used.
+
+    Parameters
+    ----------
+    filename : FilePath
+        The name of the source code file.
+
+    Returns
+    -------
+    Path
+        The data file, which may not exist if neither form is present.
+    """
     self_file = Path(filename)
     input_file = self_file.parent / f"data/{self_file.stem}.txt"
-    return_: str | list[str]
+    if not input_file.exists():
+        for suffix in _OPENERS:
+            compressed = input_file.with_name(input_file.name + suffix)
+            if compressed.exists():
+                return compressed
+    return input_file
+
+
+def read_input(
+    input_file: FilePath,
+    reader: Callable[[FilePath], Any]
+    | Literal["lines", "all", "mmap", "bytes", "stream"],
+) -> Any:
+    """Read a data file with one of the reader modes of load.
+
+    Compressed files are decompressed on the fly. They cannot be memory mapped, so the "mmap"
+    and "bytes" readers raise a ValueError for them; "stream" never holds more than the
+    read-ahead window of the decompressed text.
+    """
+    return_: str | list[str] | mmap.mmap | bytes | memoryview | Iterator[str]
     if reader == "lines":
-        with open(input_file) as f:
+        with open_text(input_file) as f:
             return_ = f.readlines()
     elif reader == "all":
-        with open(input_file) as f:
+        with open_text(input_file) as f:
             return_ = f.read()
+    elif reader == "mmap":
+        return_ = _map(input_file)
+    elif reader == "bytes":
+        return_ = memoryview(_map(input_file))
+    elif reader == "stream":
+        return_ = chain.from_iterable(read_ahead(input_file))
     else:
         return_ = reader(input_file)
     return return_
 
 
+def open_text(input_file: FilePath) -> IO[str]:
+    """Open a possibly compressed data file for reading text."""
+    opener = _OPENERS.get(Path(input_file).suffix)
+    if opener is None:
+        return open(input_file)
+    return opener(input_file, "rt")
+
+
+def _map(input_file: FilePath) -> mmap.mmap | bytes:
+    if Path(input_file).suffix in _OPENERS:
+        raise ValueError(f"Cannot memory map compressed file {input_file}")
+    # The mapping stays valid after the file object is closed.
+    with open(input_file, "rb") as f:
+        if not os.fstat(f.fileno()).st_size:
+            return b""  # mmap cannot map an empty file.
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+_END_OF_FILE = object()
+
+
+def read_ahead(
+    input_file: FilePath, batch_size: int = 4096, max_pending: int = 8
+) -> Iterator[list[str]]:
+    """Yield batches of lines from a file while a background thread reads the next ones.
+
+    The reader thread blocks once max_pending batches are waiting, so memory stays bounded by
+    batch_size * max_pending lines no matter how large the file is. Closing the iterator early
+    stops the thread.
+
+    Parameters
+    ----------
+    input_file : FilePath
+        The data file to read.
+    batch_size : int, optional
+        Number of lines per batch, by default 4096.
+    max_pending : int, optional
+        Number of batches that may be read ahead of the consumer, by default 8.
+
+    Yields
+    ------
+    list[str]
+        The next batch of lines, with their trailing newlines.
+    """
+    batches: queue.Queue[Any] = queue.Queue(maxsize=max_pending)
+    stop = threading.Event()
+
+    def put(item: Any) -> None:
+        while not stop.is_set():
+            try:
+                batches.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def read() -> None:
+        try:
+            with open_text(input_file) as f:
+                while not stop.is_set() and (batch := list(islice(f, batch_size))):
+                    put(batch)
+        except BaseException as exc:
+            put(exc)
+        put(_END_OF_FILE)
+
+    reader = threading.Thread(target=read, daemon=True)
+    reader.start()
+    try:
+        while (item := batches.get()) is not _END_OF_FILE:
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        reader.join()
+
+
+class Chunk(NamedTuple):
+    """A run of whole lines from a data file plus up to halo lines on either side."""
+
+    lines: list[str]
+    before: list[str]
+    after: list[str]
+
+
+def chunk_ranges(input_file: FilePath, n_chunks: int) -> list[tuple[int, int]]:
+    """Split a file into at most n_chunks byte ranges that start and end on line boundaries."""
+    if Path(input_file).suffix in _OPENERS:
+        raise ValueError(f"Cannot split compressed file {input_file}")
+    size = os.path.getsize(input_file)
+    boundaries = [0]
+    with open(input_file, "rb") as f:
+        for i in range(1, n_chunks):
+            f.seek(max(i * size // n_chunks - 1, boundaries[-1]))
+            f.readline()
+            if f.tell() >= size:
+                break
+            if f.tell() > boundaries[-1]:
+                boundaries.append(f.tell())
+    boundaries.append(size)
+    return list(zip(boundaries, boundaries[1:]))
+
+
+def read_chunk(input_file: FilePath, start: int, end: int, halo: int = 0) -> Chunk:
+    """Read the lines in a byte range from chunk_ranges, with halo neighbouring lines."""
+    with open(input_file, "rb") as f:
+        f.seek(start)
+        lines = f.read(end - start).decode().splitlines(True)
+        after = [line.decode() for line in islice(f, halo)]
+
+        before: list[bytes] = []
+        if halo and start:
+            # Read backwards in growing blocks until halo whole lines precede start.
+            block = 4096
+            while True:
+                block_start = max(start - block, 0)
+                f.seek(block_start)
+                preceding = f.read(start - block_start).splitlines(True)
+                # The first line is cut off unless the block reaches the start of the file.
+                if len(preceding) > halo or block_start == 0:
+                    break
+                block *= 2
+            before = preceding[-halo:]
+    return Chunk(lines, [line.decode() for line in before], after)
+
+
+def _map_chunk[
+    T
+](
+    input_file: FilePath, start: int, end: int, halo: int, mapper: Callable[[Chunk], T]
+) -> T:
+    return mapper(read_chunk(input_file, start, end, halo))
+
+
+def map_reduce[
+    T, R
+](
+    input_file: FilePath,
+    mapper: Callable[[Chunk], T],
+    reducer: Callable[[Iterable[T]], R] = sum,  # type: ignore[assignment]
+    halo: int = 0,
+    jobs: int | None = None,
+    n_chunks: int | None = None,
+) -> R:
+    """Map chunks of a data file on a process pool and reduce the partial results.
+
+    The file is split at line boundaries, so mapper only ever sees whole lines. Grid puzzles
+    that need neighbouring rows ask for them with halo; those rows are context only and
+    belong to the neighbouring chunk.
+
+    Parameters
+    ----------
+    input_file : FilePath
+        The data file, which must not be compressed.
+    mapper : Callable[[Chunk], T]
+        Computes the partial result of one chunk. It must be picklable, i.e. a module-level
+        function or a functools.partial of one.
+    reducer : Callable[[Iterable[T]], R], optional
+        Combines the partial results, by default sum.
+    halo : int, optional
+        Number of lines before and after each chunk to pass along, by default 0.
+    jobs : int | None, optional
+        Number of worker processes, by default one per core.
+    n_chunks : int | None, optional
+        Number of chunks, by default four per worker.
+
+    Returns
+    -------
+    R
+        The reduced result.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    ranges = chunk_ranges(input_file, n_chunks or 4 * jobs)
+    starts, ends = zip(*ranges)
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        partials = executor.map(
+            _map_chunk, repeat(input_file), starts, ends, repeat(halo), repeat(mapper)
+        )
+        return reducer(partials)
+
+
+def fold_lines[T](solver: Callable[[list[str]], T], chunk: Chunk) -> T:
+    """Mapper for solvers that fold over lines independently; use with functools.partial."""
+    return solver(chunk.lines)
+
+
+class Grid:
+    """Rectangular grid of byte cells held in one flat bytearray, for grid puzzles.
+
+    The grid is surrounded by a one cell border of sentinel cells, so that every cell has
+    eight neighbours and rows are kept apart. Cells are addressed by flat index: cell (x, y)
+    is at (y + 1) * stride + x + 1, where stride is the width plus the two border cells, and
+    its neighbours are at index + offset for each of neighbour_offsets.
+
+    Parameters
+    ----------
+    lines : Iterable[str]
+        Rows of the grid, without or with their line endings. Shorter rows are padded with
+        the sentinel.
+    sentinel : bytes, optional
+        Cell used for the border and the padding, by default b".".
+    """
+
+    __slots__ = ("width", "height", "stride", "cells", "neighbour_offsets")
+
+    def __init__(self, lines: Iterable[str], sentinel: bytes = b".") -> None:
+        rows = [line.rstrip("\r\n").encode() for line in lines]
+        self.width = max(map(len, rows), default=0)
+        self.height = len(rows)
+        self.stride = self.width + 2
+        self.cells = bytearray(sentinel * self.stride)
+        for row in rows:
+            self.cells += sentinel + row.ljust(self.width, sentinel) + sentinel
+        self.cells += sentinel * self.stride
+        self.neighbour_offsets = tuple(
+            row * self.stride + column
+            for row in (-1, 0, 1)
+            for column in (-1, 0, 1)
+            if row or column
+        )
+
+    def index(self, x: int, y: int) -> int:
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise IndexError(f"Cell ({x}, {y}) is outside the grid")
+        return (y + 1) * self.stride + x + 1
+
+    def neighbours(self, index: int) -> Iterator[int]:
+        """Indices of the eight cells around a cell."""
+        return (index + offset for offset in self.neighbour_offsets)
+
+    def row(self, y: int) -> memoryview:
+        start = self.index(0, y)
+        return memoryview(self.cells)[start : start + self.width]
+
+    def runs(self, pattern: re.Pattern[bytes]) -> Iterator[re.Match[bytes]]:
+        """Matches of pattern over the cells, spanning flat indices.
+
+        As long as pattern does not match the sentinel, no match spans two rows.
+        """
+        return pattern.finditer(self.cells)
+
+    def lines(self) -> list[str]:
+        return [self.row(y).tobytes().decode() for y in range(self.height)]
+
+
+def file_digest(input_file: FilePath) -> str:
+    """SHA-256 of a file's raw bytes, read in chunks."""
+    with open(input_file, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def cached_parse[
+    T
+](
+    filename: FilePath,
+    parser: Callable[[Iterator[str]], T],
+    version: int,
+    max_bytes: int = 64 * 2**20,
+    cache_dir: FilePath = CACHE_DIR,
+    instrumentation: Instrumentation | None = None,
+) -> T:
+    """Parse the data for a challenge, reusing the result of an earlier run if possible.
+
+    Parsed inputs are stored with marshal, so the parser must return plain builtins (ints,
+    strings, tuples, lists, sets, ...) or an array.array. Entries are keyed by the SHA-256 of the data file and
+    the parser version, and the least recently used ones are removed once the cache grows past
+    max_bytes.
+
+    Parameters
+    ----------
+    filename : FilePath
+        The name of the source code file.
+    parser : Callable[[Iterator[str]], T]
+        Turns the lines of the data file into the parsed representation.
+    version : int
+        Version of the parser. Bump it whenever the parsed representation changes.
+    max_bytes : int, optional
+        Size limit of the cache directory, by default 64 MiB.
+    cache_dir : FilePath, optional
+        Where the cache lives, by default CACHE_DIR.
+    instrumentation : Instrumentation | None, optional
+        If given, hashing the data file and reading the cache entry run as its "load" phase
+        and parsing the data file on a miss as its "parse" phase, by default None.
+
+    Returns
+    -------
+    T
+        The parsed input.
+    """
+    input_file = input_path(filename)
+    parsed_dir = Path(cache_dir) / "parsed"
+    with nullcontext() if instrumentation is None else instrumentation.phase("load"):
+        entry = parsed_dir / (
+            f"{Path(filename).stem}-{parser.__name__}-v{version}-"
+            f"{file_digest(input_file)}.bin"
+        )
+        try:
+            parsed = _load_parsed(entry.read_bytes())
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+        else:
+            os.utime(entry)  # Mark as recently used.
+            return parsed
+
+    with nullcontext() if instrumentation is None else instrumentation.phase("parse"):
+        parsed = parser(read_input(input_file, "stream"))
+    parsed_dir.mkdir(parents=True, exist_ok=True)
+    tmp_file = entry.with_suffix(f".{os.getpid()}.tmp")
+    tmp_file.write_bytes(_dump_parsed(parsed))
+    tmp_file.replace(entry)
+    _evict(parsed_dir, max_bytes)
+    return parsed
+
+
+def _dump_parsed(parsed: Any) -> bytes:
+    if isinstance(parsed, array):
+        return b"A" + parsed.typecode.encode() + parsed.tobytes()
+    return b"M" + marshal.dumps(parsed)
+
+
+def _load_parsed(data: bytes) -> Any:
+    if data[:1] == b"A":
+        return array(data[1:2].decode(), data[2:])
+    if data[:1] == b"M":
+        return marshal.loads(data[1:])
+    raise ValueError("Unknown parsed input format")
+
+
+def _evict(cache_dir: Path, max_bytes: int) -> None:
+    entries = sorted(
+        ((entry.stat(), entry) for entry in cache_dir.glob("*.bin")),
+        key=lambda item: item[0].st_mtime,
+    )
+    total = sum(stat.st_size for stat, _ in entries)
+    for stat, entry in entries:
+        if total <= max_bytes:
+            break
+        entry.unlink(missing_ok=True)
+        total -= stat.st_size
+
+
+class ResultStore:
+    """Answers of earlier runs, keyed by fingerprints of the solver and of its input.
+
+    The solver fingerprint covers its bytecode, constants and defaults, plus those of the
+    module-level functions, patterns and immutable constants it refers to, so editing any of
+    them invalidates the answer while moving code around does not. Any other global it
+    refers to, such as a class or a mutable table, is covered by the source of the module
+    that defines it rather than by its current state. Solvers that are not plain functions
+    or that close over variables are never stored. The input fingerprint is the input
+    itself: its bytes for buffers, its marshalled form otherwise. Iterators cannot be
+    fingerprinted without consuming them, so their answers are never stored.
+
+    Looking an answer up only reorders the entries in memory; the order is saved along with
+    the next answer put in the store.
+
+    Parameters
+    ----------
+    path : FilePath, optional
+        JSON file holding the answers, by default results.json in CACHE_DIR.
+    max_entries : int, optional
+        How many answers to keep, by default 1024.
+    policy : Literal["lru", "fifo"], optional
+        Which answer to evict when full: the least recently used one or the oldest one, by
+        default "lru".
+    """
+
+    def __init__(
+        self,
+        path: FilePath = CACHE_DIR / "results.json",
+        max_entries: int = 1024,
+        policy: Literal["lru", "fifo"] = "lru",
+    ) -> None:
+        if policy not in ("lru", "fifo"):
+            raise ValueError(f"Unknown eviction policy {policy!r}")
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.policy = policy
+        # Ordered from next to be evicted to last.
+        self._answers: dict[str, int]
+        try:
+            self._answers = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            self._answers = {}
+        # Keys put or looked up since the last save, the only ones merged into the file.
+        self._touched: set[str] = set()
+
+    def key(self, input_: Any, solver: Callable[..., Any]) -> str | None:
+        digest = hashlib.sha256()
+        if not (
+            _fingerprint_solver(solver, digest) and _fingerprint_input(input_, digest)
+        ):
+            return None
+        return digest.hexdigest()
+
+    def get(self, key: str) -> int | None:
+        answer = self._answers.get(key)
+        if answer is not None and self.policy == "lru":
+            self._answers[key] = self._answers.pop(key)
+            self._touched.add(key)
+        return answer
+
+    def put(self, key: str, answer: int) -> None:
+        self._answers.pop(key, None)
+        self._answers[key] = answer
+        self._touched.add(key)
+        while len(self._answers) > self.max_entries:
+            del self._answers[next(iter(self._answers))]
+        self._save()
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Several processes may share the store, so only move the entries this one put or
+        # looked up to the end of what they saved meanwhile, in this process's order.
+        with open(self.path.with_suffix(".lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                answers = json.loads(self.path.read_text())
+            except (OSError, ValueError):
+                answers = {}
+            for key, answer in self._answers.items():
+                if key in self._touched:
+                    answers.pop(key, None)
+                    answers[key] = answer
+            while len(answers) > self.max_entries:
+                del answers[next(iter(answers))]
+            tmp_file = self.path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_file.write_text(json.dumps(answers))
+            tmp_file.replace(self.path)
+        self._answers = answers
+        self._touched.clear()
+
+
+def _fingerprint_solver(
+    solver: Callable[..., Any], digest: Any, seen: set[int] | None = None
+) -> bool:
+    if not isinstance(solver, FunctionType) or solver.__closure__:
+        return False
+    seen = set() if seen is None else seen
+    seen.add(id(solver))
+    digest.update(
+        f"{solver.__qualname__}{solver.__defaults__}{solver.__kwdefaults__}".encode()
+    )
+    for name in _fingerprint_code(solver.__code__, digest):
+        if name not in solver.__globals__:
+            continue  # An attribute or a builtin.
+        value = solver.__globals__[name]
+        if isinstance(value, FunctionType):
+            if id(value) not in seen and not _fingerprint_solver(value, digest, seen):
+                return False
+        elif isinstance(value, re.Pattern):
+            digest.update(f"{name}{value.pattern!r}{value.flags}".encode())
+        elif _is_constant(value):
+            digest.update(f"{name}{value!r}".encode())
+        elif isinstance(value, ModuleType):
+            continue  # Libraries are not fingerprinted.
+        else:
+            module = value.__module__ if isinstance(value, type) else solver.__module__
+            source_digest = _module_source_digest(module)
+            if source_digest is None:
+                return False
+            digest.update(f"{name}{source_digest}".encode())
+    return True
+
+
+def _is_constant(value: Any) -> bool:
+    """Whether a value is immutable all the way down, so that its repr identifies it."""
+    if type(value) is tuple:
+        return all(map(_is_constant, value))
+    return type(value) in (NoneType, bool, int, float, str, bytes)
+
+
+@cache
+def _module_source_digest(module: str) -> str | None:
+    """SHA-256 of a module's source file, as loaded, or None if it has none."""
+    source = getattr(sys.modules.get(module), "__file__", None)
+    if source is None:
+        return None
+    try:
+        return file_digest(source)
+    except OSError:
+        return None
+
+
+def _fingerprint_code(code: CodeType, digest: Any) -> set[str]:
+    """Hash the parts of a code object that affect behaviour and return the names it uses."""
+    digest.update(code.co_code)
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            names |= _fingerprint_code(const, digest)
+        elif isinstance(const, frozenset):
+            digest.update(repr(sorted(map(repr, const))).encode())
+        else:
+            digest.update(repr(const).encode())
+    digest.update(repr(sorted(names)).encode())
+    return names
+
+
+def _fingerprint_input(input_: Any, digest: Any) -> bool:
+    if isinstance(input_, (bytes, bytearray, memoryview, mmap.mmap, array)):
+        digest.update(input_)
+        return True
+    try:
+        digest.update(marshal.dumps(input_))
+    except ValueError:
+        return False
+    return True
+
+
+class Instrumentation:
+    """Collects per-phase timings, peak memory and cProfile stats while solving.
+
+    Each measure block makes one entry of the report, usually for one part of one day.
+    Inside it, phase blocks time the load, parse and compute stages with perf_counter_ns.
+
+    Parameters
+    ----------
+    trace_memory : bool, optional
+        Record the peak memory allocated during each measure block with tracemalloc, which
+        slows the code being measured down, by default False.
+    profile_dir : FilePath | None, optional
+        If given, a cProfile stats file per measure block is written there, by default None.
+    """
+
+    def __init__(
+        self, trace_memory: bool = False, profile_dir: FilePath | None = None
+    ) -> None:
+        self.trace_memory = trace_memory
+        self.profile_dir = None if profile_dir is None else Path(profile_dir)
+        self.entries: list[dict[str, Any]] = []
+        self._current: dict[str, Any] | None = None
+
+    @contextmanager
+    def measure(self, label: str) -> Iterator[dict[str, Any]]:
+        """Measure a block as one entry, or extend the entry already being measured."""
+        if self._current is not None:
+            yield self._current
+            return
+
+        entry: dict[str, Any] = {"label": label, "phases_ns": {}}
+        self._current = entry
+        started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        profiler = None if self.profile_dir is None else cProfile.Profile()
+        start = time.perf_counter_ns()
+        try:
+            if profiler is not None:
+                profiler.enable()
+            yield entry
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            entry["total_ns"] = time.perf_counter_ns() - start
+            if self.trace_memory:
+                entry["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+            if started_tracing:
+                tracemalloc.stop()
+            if profiler is not None and self.profile_dir is not None:
+                self.profile_dir.mkdir(parents=True, exist_ok=True)
+                stem = re.sub(r"\W+", "_", label)
+                stats_file = self.profile_dir / f"{stem}.pstats"
+                profiler.dump_stats(stats_file)
+                entry["profile"] = str(stats_file)
+            self._current = None
+            self.entries.append(entry)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Add the time spent in a block to a phase of the current entry."""
+        with self.measure(name) as entry:
+            start = time.perf_counter_ns()
+            try:
+                yield
+            finally:
+                phases = entry["phases_ns"]
+                phases[name] = phases.get(name, 0) + time.perf_counter_ns() - start
+
+    def report(self) -> dict[str, Any]:
+        return {"python": sys.version, "time": time.time(), "entries": self.entries}
+
+    def write(self, report_file: FilePath) -> None:
+        Path(report_file).write_text(json.dumps(self.report(), indent=2))
+
+
+def compute_answer[
+    T
+](input_: T, solver: Callable[[T], int], store: ResultStore | None = None) -> int:
+    """Run a solver, or return its stored answer for this input if there is one."""
+    if store is None or (key := store.key(input_, solver)) is None:
+        return solver(input_)
+    answer = store.get(key)
+    if answer is None:
+        answer = solver(input_)
+        store.put(key, answer)
+    return answer
+
+
 def test_solve[
     T
-](input_: T, solver: Callable[[T], int], part: Part, solution: int) -> None:
-    answer = solver(input_)
+](
+    input_: T,
+    solver: Callable[[T], int],
+    part: Part,
+    solution: int,
+    store: ResultStore | None = None,
+) -> None:
+    answer = compute_answer(input_, solver, store)
     assert solution == answer, f"Answer {answer} should be {solution} for part {part}"
     print(f"Test for part {part} passed")
 
 
-def solve[T](input_: T, solver: Callable[[T], int], part: Part) -> None:
-    solution = solver(input_)
+def solve[
+    T
+](
+    input_: T,
+    solver: Callable[[T], int],
+    part: Part,
+    store: ResultStore | None = None,
+    instrumentation: Instrumentation | None = None,
+) -> int:
+    """Solve one part of a challenge and print the answer.
+
+    If a store is given, an answer it already holds for this solver and input is printed
+    instead of running the solver. If instrumentation is given, the solver runs as the
+    "compute" phase of the entry being measured, or else of a new entry for the part.
+    """
+    if instrumentation is None:
+        solution = compute_answer(input_, solver, store)
+    else:
+        with instrumentation.measure(f"part {part}"), instrumentation.phase("compute"):
+            solution = compute_answer(input_, solver, store)
     print(f"Part {part} solution: {solution}")
+    return solution
+
+
+class Solver[P](Protocol):
+    """A day's challenge, split into a parse stage and the parts that share its output."""
+
+    @property
+    def day(self) -> int:
+        """Day of the challenge."""
+
+    @property
+    def source(self) -> FilePath:
+        """The name of the source code file, used to find the data file."""
+
+    def load(self, instrumentation: Instrumentation | None = None) -> P:
+        """Read and parse the data for the challenge, timing the phases if instrumented."""
+        ...
+
+    def parse(self, lines: Iterable[str]) -> P:
+        ...
+
+    def solver(self, part: Part) -> Callable[[P], int] | None:
+        """The function answering part from the parsed input, if that part is solved."""
+        ...
+
+
+@dataclass(frozen=True)
+class DaySolver[P]:
+    """Solver made of a day's module-level functions.
+
+    Parameters
+    ----------
+    day : int
+        Day of the challenge.
+    source : FilePath
+        The name of the source code file, used to find the data file.
+    parse : Callable[[Iterable[str]], P]
+        Turns the lines of the data into the input of both parts.
+    part_1 : Callable[[P], int]
+        Solves part 1 from the parsed input.
+    part_2 : Callable[[P], int] | None, optional
+        Solves part 2 from the parsed input, by default None while it is unsolved.
+    parser_version : int | None, optional
+        If given, parsed inputs are cached on disk with cached_parse under this version, by
+        default None.
+    """
+
+    day: int
+    source: FilePath
+    parse: Callable[[Iterable[str]], P]
+    part_1: Callable[[P], int]
+    part_2: Callable[[P], int] | None = None
+    parser_version: int | None = None
+
+    def load(self, instrumentation: Instrumentation | None = None) -> P:
+        """Read and parse the data file, through cached_parse if there is a parser_version.
+
+        If instrumentation is given, the data file is streamed into parse as its "parse"
+        phase, or cached_parse times its own "load" and "parse" phases. They belong to the
+        entry being measured, or else to a new "day NN load" entry.
+        """
+        if instrumentation is None:
+            return self._load()
+        with instrumentation.measure(f"day {self.day:02d} load"):
+            return self._load(instrumentation)
+
+    def _load(self, instrumentation: Instrumentation | None = None) -> P:
+        if self.parser_version is None:
+            with nullcontext() if instrumentation is None else instrumentation.phase(
+                "parse"
+            ):
+                return self.parse(read_input(input_path(self.source), "stream"))
+        return cached_parse(
+            self.source,
+            self.parse,
+            self.parser_version,
+            instrumentation=instrumentation,
+        )
+
+    def solver(self, part: Part) -> Callable[[P], int] | None:
+        return self.part_1 if part == Part.ONE else self.part_2
+
+    def run(
+        self,
+        parsed: P,
+        parts: Iterable[Part] = tuple(Part),
+        store: ResultStore | None = None,
+        instrumentation: Instrumentation | None = None,
+    ) -> dict[Part, int]:
+        """Solve and print every solved part from a single parsed input.
+
+        If instrumentation is given, each part is measured as one "day NN part N" entry.
+        """
+        solutions = {}
+        for part in parts:
+            solver = self.solver(part)
+            if solver is None:
+                continue
+            if instrumentation is None:
+                solutions[part] = solve(parsed, solver, part, store)
+                continue
+            with instrumentation.measure(f"day {self.day:02d} part {part}"):
+                solutions[part] = solve(parsed, solver, part, store, instrumentation)
+        return solutions
+
+    def test(self, lines: Iterable[str], solutions: dict[Part, int]) -> None:
+        """Check the parts against the puzzle examples, parsing the example once."""
+        parsed = self.parse(lines)
+        for part, solution in solutions.items():
+            solver = self.solver(part)
+            assert solver is not None, f"Part {part} is not solved yet"
+            test_solve(parsed, solver, part, solution)
+
+
+class Engine(NamedTuple):
+    """One implementation of a part and the reader mode of load it takes its input from.
+
+    A reader of "path" passes the path of the data file itself.
+    """
+
+    name: str
+    function: Callable[[Any], int]
+    reader: str
+
+    def run(self, input_file: FilePath) -> int:
+        if self.reader == "path":
+            return self.function(input_file)
+        return self.function(read_input(input_file, self.reader))  # type: ignore
+
+
+# Every implementation of every part, by day and part and then by name. The day modules'
+# line-based solve_part_* functions are registered as "reference".
+ENGINES: dict[tuple[int, Part], dict[str, Engine]] = {}
+
+
+def engine[
+    F: Callable[..., int]
+](
+    day: int, part: Part, name: str, reader: str = "lines", requires: str | None = None
+) -> Callable[[F], F]:
+    """Decorator adding a function to ENGINES as an implementation of a part.
+
+    If the implementation needs an optional package, name it as requires: the function is
+    then only added when that package is installed.
+    """
+
+    def decorator(function: F) -> F:
+        if requires is None or importlib.util.find_spec(requires) is not None:
+            ENGINES.setdefault((day, part), {})[name] = Engine(name, function, reader)
+        return function
+
+    return decorator
+
+
+SOLVERS: dict[int, Solver[Any]] = {}
+
+
+def register[S: Solver[Any]](solver: S) -> S:
+    """Add a solver to SOLVERS under its day, and each of its parts to ENGINES."""
+    SOLVERS[solver.day] = solver
+    for part in Part:
+        part_solver = solver.solver(part)
+        if part_solver is not None:
+            ENGINES.setdefault((solver.day, part), {})["solver"] = Engine(
+                "solver",
+                partial(_parse_and_solve, solver.parse, part_solver),
+                "stream",
+            )
+    return solver
+
+
+def _parse_and_solve[
+    P
+](
+    parse: Callable[[Iterable[str]], P], solve: Callable[[P], int], lines: Iterable[str]
+) -> int:
+    return solve(parse(lines))